@@ -0,0 +1,317 @@
+# benchmarks/run.py
+#
+# Latency/throughput benchmark for the /djangoapp/api/* routes.
+#
+#   python -m benchmarks.run --latency-ms 20 --concurrency 1,8,32 --requests 200
+#
+# Starts the upstream stubs (benchmarks/stubs.py), serves the Django app from
+# a threaded in-process WSGI server (or targets an already running server
+# with --target), drives every API route at each concurrency level and writes
+# the results as JSON under benchmarks/results/. The in-process server uses
+# a fresh temporary SQLite database and cache directory (seeded with the car
+# catalog), unless --database-url is given. A request counts as an error
+# unless it answers 2xx or 3xx.
+
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import shutil
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import requests
+
+from .stubs import SERVER_DIR, start_stubs
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BENCH_USER = "bench_user"
+BENCH_PASSWORD = "bench-password-123"
+DEALER_IDS = list(range(1, 51))
+STATES = ["Texas", "Kansas", "California", "New York"]
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def review_payload(dealer_id):
+    return {
+        "name": BENCH_USER,
+        "dealership": dealer_id,
+        "review": "Great service and a fantastic car",
+        "purchase": True,
+        "purchase_date": "01/15/2024",
+        "car_make": "Toyota",
+        "car_model": "Camry",
+        "car_year": 2023,
+    }
+
+
+def api_routes():
+    """(name, method, path factory, body factory) for every API route."""
+    counter = itertools.count()
+    return [
+        ("login", "POST", lambda i: "/djangoapp/api/login/",
+         lambda i: {"userName": BENCH_USER, "password": BENCH_PASSWORD}),
+        ("register", "POST", lambda i: "/djangoapp/api/register/",
+         lambda i: {"userName": f"bench_{os.getpid()}_{time.time_ns()}_{next(counter)}",
+                    "password": BENCH_PASSWORD, "firstName": "Bench", "lastName": "User",
+                    "email": "bench@example.com"}),
+        ("get_cars", "GET", lambda i: "/djangoapp/api/get_cars/", None),
+        ("dealers", "GET", lambda i: "/djangoapp/api/dealers/", None),
+        ("dealers_nearby", "GET",
+         lambda i: f"/djangoapp/api/dealers/nearby/?lat={30 + i % 15}&lon={-120 + i % 40}&limit=5",
+         None),
+        ("dealers_by_state", "GET",
+         lambda i: f"/djangoapp/api/dealers/{STATES[i % len(STATES)]}/", None),
+        ("dealer", "GET", lambda i: f"/djangoapp/api/dealer/{DEALER_IDS[i % 50]}/", None),
+        ("dealer_full", "GET",
+         lambda i: f"/djangoapp/api/dealer/{DEALER_IDS[i % 50]}/full/", None),
+        ("dealer_reviews", "GET",
+         lambda i: f"/djangoapp/api/reviews/dealer/{DEALER_IDS[i % 50]}/", None),
+        ("dealer_reviews_stream", "GET",
+         lambda i: f"/djangoapp/api/reviews/dealer/{DEALER_IDS[i % 50]}/?stream=ndjson", None),
+        ("inventory", "GET", lambda i: f"/djangoapp/get_inventory/{DEALER_IDS[i % 50]}", None),
+        ("inventory_search", "GET",
+         lambda i: ("/djangoapp/api/inventory/search/?make=Toyota,Kia&year_min=2021"
+                    f"&price_max={20000 + 1000 * (i % 40)}&sort=-year&limit=20"), None),
+        ("add_review", "POST", lambda i: "/djangoapp/api/add_review/",
+         lambda i: review_payload(DEALER_IDS[i % 50])),
+        ("logout", "POST", lambda i: "/djangoapp/api/logout/", None),
+    ]
+
+
+def start_django(host, port):
+    """Set up Django against the stubs and serve it from a background thread."""
+    sys.path.insert(0, str(SERVER_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command("migrate", verbosity=0)
+    call_command("createcachetable", verbosity=0)
+    # get_cars reads the catalog tables, so measure it against real rows
+    call_command("load_catalog", seed=True, stdout=io.StringIO())
+    from django.contrib.auth.models import User
+    if not User.objects.filter(username=BENCH_USER).exists():
+        User.objects.create_user(username=BENCH_USER, password=BENCH_PASSWORD)
+    from django.core.wsgi import get_wsgi_application
+
+    server = make_server(host, port, get_wsgi_application(),
+                         server_class=ThreadingWSGIServer, handler_class=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def calls_delta(before, after):
+    delta = {}
+    for name, counts in after.items():
+        for template, count in counts.items():
+            diff = count - before.get(name, {}).get(template, 0)
+            if diff:
+                delta[f"{name} {template}"] = diff
+    return delta
+
+
+def run_route(target, route, concurrency, total, stubs):
+    name, method, path_for, body_for = route
+    local = threading.local()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            if name == "add_review":
+                local.session.post(f"{target}/djangoapp/api/login/",
+                                   json={"userName": BENCH_USER, "password": BENCH_PASSWORD})
+        return local.session
+
+    def one(i):
+        body = body_for(i) if body_for else None
+        started = time.perf_counter()
+        try:
+            response = session().request(method, f"{target}{path_for(i)}", json=body, timeout=60)
+            ok = 200 <= response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        return (time.perf_counter() - started) * 1000.0, ok
+
+    before = {n: s.snapshot() for n, s in stubs.items()}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    after = {n: s.snapshot() for n, s in stubs.items()}
+
+    latencies = sorted(latency for latency, _ in samples)
+    upstream = calls_delta(before, after)
+    return {
+        "route": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": sum(1 for _, ok in samples if not ok),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2),
+        },
+        "upstream_calls": upstream,
+        "upstream_calls_per_request": round(sum(upstream.values()) / total, 3),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {(r["route"], r["concurrency"]): r for r in baseline["results"]}
+    print(f"\nComparison with {baseline_path} (p95 ms / rps):")
+    for result in current["results"]:
+        old = previous.get((result["route"], result["concurrency"]))
+        if old is None:
+            continue
+        print(f"  {result['route']:<18} c={result['concurrency']:<4} "
+              f"p95 {old['latency_ms']['p95']:>9} -> {result['latency_ms']['p95']:>9}   "
+              f"rps {old['throughput_rps']:>8} -> {result['throughput_rps']:>8}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Injected latency for every upstream stub.")
+    parser.add_argument("--backend-latency-ms", type=float,
+                        help="Override for the dealer/review API.")
+    parser.add_argument("--inventory-latency-ms", type=float,
+                        help="Override for the inventory API.")
+    parser.add_argument("--sentiment-latency-ms", type=float,
+                        help="Override for the sentiment service.")
+    parser.add_argument("--review-scale", type=int, default=1,
+                        help="Repeat the seed reviews N times to grow per-dealer review counts.")
+    parser.add_argument("--concurrency", default="1,8,32",
+                        help="Comma-separated concurrency levels.")
+    parser.add_argument("--requests", type=int, default=100,
+                        help="Requests per route and concurrency level.")
+    parser.add_argument("--routes", help="Comma-separated subset of route names to run.")
+    parser.add_argument("--target",
+                        help="Benchmark an already running server (e.g. http://127.0.0.1:8000). "
+                             "It must be configured to use the stub URLs.")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the in-process server.")
+    parser.add_argument("--database-url",
+                        help="DATABASE_URL for the in-process server "
+                             "(default: a temporary SQLite database).")
+    parser.add_argument("--output",
+                        help="Result file (default: benchmarks/results/<timestamp>.json).")
+    parser.add_argument("--compare", help="Earlier result file to print deltas against.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    overrides = {
+        "backend": args.backend_latency_ms,
+        "inventory": args.inventory_latency_ms,
+        "sentiment": args.sentiment_latency_ms,
+    }
+    latency = {name: args.latency_ms if value is None else value
+               for name, value in overrides.items()}
+    stubs = start_stubs(latency["backend"], latency["inventory"], latency["sentiment"],
+                        review_scale=args.review_scale)
+    # Point the Django app at the stubs before it is imported.
+    os.environ["backend_url"] = stubs["backend"].url
+    os.environ["searchcars_url"] = stubs["inventory"].url
+    os.environ["sentiment_analyzer_url"] = stubs["sentiment"].url + "/analyze"
+
+    server = None
+    workdir = None
+    target = args.target
+    if not target:
+        # Keep the developer's db.sqlite3 and cache files out of the run
+        workdir = tempfile.mkdtemp(prefix="djangoapp-bench-")
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.sqlite3"
+        os.environ["DJANGO_CACHE_DIR"] = os.path.join(workdir, "cache")
+        server = start_django("127.0.0.1", args.port)
+        target = f"http://127.0.0.1:{args.port}"
+
+    routes = api_routes()
+    if args.routes:
+        wanted = set(args.routes.split(","))
+        routes = [route for route in routes if route[0] in wanted]
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+    for route in routes:
+        for concurrency in levels:
+            result = run_route(target, route, concurrency, args.requests, stubs)
+            results.append(result)
+            latency_ms = result['latency_ms']
+            print(f"{result['route']:<18} c={concurrency:<4} "
+                  f"p50 {latency_ms['p50']:>8}ms  p95 {latency_ms['p95']:>8}ms  "
+                  f"p99 {latency_ms['p99']:>8}ms  {result['throughput_rps']:>8} rps  "
+                  f"errors {result['errors']:<4} "
+                  f"upstream/req {result['upstream_calls_per_request']}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "target": args.target or "in-process wsgiref",
+            "upstream_latency_ms": latency,
+            "review_scale": args.review_scale,
+            "concurrency": levels,
+            "requests_per_level": args.requests,
+        },
+        "results": results,
+    }
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {output}")
+    if args.compare:
+        compare(report, args.compare)
+
+    if server is not None:
+        server.shutdown()
+    for stub in stubs.values():
+        stub.stop()
+    if workdir is not None:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# benchmarks/stubs.py
+#
+# Local stand-ins for the upstream services the Django app talks to:
+# the dealership/review API (Node, port 3030), the car inventory API
+# (Node, port 3050) and the sentiment analyzer (Flask, port 5050).
+# Each stub serves the repo's seed data, sleeps for a configurable latency
+# before answering and counts calls per endpoint template.
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+DEALERSHIPS_FILE = SERVER_DIR / "database" / "data" / "dealerships.json"
+REVIEWS_FILE = SERVER_DIR / "database" / "data" / "reviews.json"
+CARS_FILE = SERVER_DIR / "carsInventory" / "data" / "car_records.json"
+
+POSITIVE_WORDS = {"good", "great", "excellent", "love", "best", "amazing", "fantastic"}
+NEGATIVE_WORDS = {"bad", "poor", "terrible", "worst", "hate", "awful", "slow"}
+
+
+def load_seed_data(review_scale=1):
+    """
+    Return ``(dealers, reviews, cars)`` from the repo's seed files. With
+    ``review_scale`` > 1 the reviews are repeated under fresh ids to
+    simulate dealers with many reviews.
+    """
+    dealers = json.loads(DEALERSHIPS_FILE.read_text())["dealerships"]
+    seed_reviews = json.loads(REVIEWS_FILE.read_text())["reviews"]
+    cars = json.loads(CARS_FILE.read_text())["cars"]
+    reviews = []
+    for copy in range(review_scale):
+        for review in seed_reviews:
+            reviews.append(dict(review, id=copy * len(seed_reviews) + review["id"]))
+    return dealers, reviews, cars
+
+
+def score_text(text):
+    """Cheap keyword rule standing in for VADER."""
+    words = set(re.findall(r"[a-z]+", text.lower()))
+    pos, neg = len(words & POSITIVE_WORDS), len(words & NEGATIVE_WORDS)
+    if neg > pos:
+        return "negative"
+    if pos > neg:
+        return "positive"
+    return "neutral"
+
+
+class UpstreamStub:
+    """One stub HTTP server with injected latency and per-route call counts."""
+
+    def __init__(self, name, port, routes, latency_ms=0.0, host="127.0.0.1"):
+        self.name = name
+        self.port = port
+        self.host = host
+        self.routes = routes
+        self.latency = latency_ms / 1000.0
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def record(self, template):
+        with self._lock:
+            self.calls[template] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.calls)
+
+    def dispatch(self, method, path, body):
+        for route_method, pattern, template, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                self.record(template)
+                return handler(body, *[unquote(group) for group in match.groups()])
+        self.record("<unmatched>")
+        return 404, {"error": "Route not found"}
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else None
+                if stub.latency:
+                    time.sleep(stub.latency)
+                path, _, query = self.path.partition("?")
+                path = "/" + path.strip("/")
+                if query:
+                    # The Django client sends the single-text sentiment call as ?text=
+                    path = f"{path}?{query}"
+                status, payload = stub.dispatch(method, path, body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def _route(method, regex, template, handler):
+    return method, re.compile(regex), template, handler
+
+
+def backend_stub(dealers, reviews, port=3030, latency_ms=0.0):
+    lock = threading.Lock()
+
+    def dealer_reviews(_, dealer_id):
+        return 200, [r for r in reviews if str(r["dealership"]) == dealer_id]
+
+    def dealers_by_state(_, state):
+        return 200, [d for d in dealers if d["state"] == state]
+
+    def dealer(_, dealer_id):
+        found = [d for d in dealers if str(d["id"]) == dealer_id]
+        return (200, found[0]) if found else (404, {"error": "Dealer not found"})
+
+    def _insert(body):
+        key = (body or {}).get("idempotency_key")
+        existing = [r for r in reviews if key and r.get("idempotency_key") == key]
+        if existing:
+            return existing[0]
+        review = dict(body or {}, id=max((r["id"] for r in reviews), default=0) + 1)
+        reviews.append(review)
+        return review
+
+    def insert_review(body):
+        with lock:
+            return 200, _insert(body)
+
+    def insert_reviews(body):
+        with lock:
+            return 200, {"reviews": [_insert(item) for item in (body or {}).get("reviews", [])]}
+
+    def reviews_since(_, query):
+        params = parse_qs(query)
+        since = int(params.get("since_id", ["0"])[0])
+        limit = int(params.get("limit", ["0"])[0])
+        newer = sorted((r for r in reviews if r["id"] > since), key=lambda r: r["id"])
+        return 200, newer[:limit] if limit else newer
+
+    def update_sentiments(body):
+        labels = {item["id"]: item["sentiment"] for item in (body or {}).get("sentiments", [])}
+        with lock:
+            matched = [r for r in reviews if r["id"] in labels]
+            for review in matched:
+                review["sentiment"] = labels[review["id"]]
+        return 200, {"matched": len(matched), "modified": len(matched)}
+
+    return UpstreamStub("backend", port, [
+        _route("GET", r"/fetchReviews", "/fetchReviews", lambda _: (200, reviews)),
+        _route("GET", r"/fetchReviews\?(.*)", "/fetchReviews", reviews_since),
+        _route("GET", r"/fetchReviews/dealer/([^/]+)", "/fetchReviews/dealer/:id", dealer_reviews),
+        _route("GET", r"/fetchDealers", "/fetchDealers", lambda _: (200, dealers)),
+        _route("GET", r"/fetchDealers/([^/]+)", "/fetchDealers/:state", dealers_by_state),
+        _route("GET", r"/fetchDealer/([^/]+)", "/fetchDealer/:id", dealer),
+        _route("POST", r"/insert_review", "/insert_review", insert_review),
+        _route("POST", r"/insert_reviews", "/insert_reviews", insert_reviews),
+        _route("POST", r"/update_sentiments", "/update_sentiments", update_sentiments),
+    ], latency_ms)
+
+
+def inventory_stub(cars, port=3050, latency_ms=0.0):
+    def by_dealer(dealer_id, predicate=lambda car: True):
+        return 200, [c for c in cars if str(c["dealer_id"]) == dealer_id and predicate(c)]
+
+    return UpstreamStub("inventory", port, [
+        _route("GET", r"/cars/([^/]+)", "/cars/:id", lambda _, d: by_dealer(d)),
+        _route("GET", r"/carsbymake/([^/]+)/([^/]+)", "/carsbymake/:id/:make",
+               lambda _, d, make: by_dealer(d, lambda c: c["make"] == make)),
+        _route("GET", r"/carsbymodel/([^/]+)/([^/]+)", "/carsbymodel/:id/:model",
+               lambda _, d, model: by_dealer(d, lambda c: c["model"] == model)),
+        _route("GET", r"/carsbyyear/([^/]+)/([^/]+)", "/carsbyyear/:id/:year",
+               lambda _, d, year: by_dealer(d, lambda c: c["year"] >= int(year))),
+        _route("GET", r"/carsbymaxmileage/([^/]+)/([^/]+)", "/carsbymaxmileage/:id/:mileage",
+               lambda _, d, mileage: by_dealer(d, lambda c: c["mileage"] <= int(mileage))),
+        _route("GET", r"/carsbyprice/([^/]+)/([^/]+)", "/carsbyprice/:id/:price",
+               lambda _, d, price: by_dealer(d, lambda c: c["price"] <= int(price))),
+    ], latency_ms)
+
+
+def sentiment_stub(port=5050, latency_ms=0.0):
+    def batch(body):
+        texts = (body or {}).get("texts") or []
+        return 200, {"sentiments": [score_text(str(text)) for text in texts]}
+
+    return UpstreamStub("sentiment", port, [
+        _route("GET", r"/analyze\?text=(.*)", "/analyze?text=",
+               lambda _, t: (200, {"sentiment": score_text(t)})),
+        _route("GET", r"/analyze/(.+)", "/analyze/:text",
+               lambda _, t: (200, {"sentiment": score_text(t)})),
+        _route("POST", r"/analyze_batch", "/analyze_batch", batch),
+    ], latency_ms)
+
+
+def start_stubs(backend_latency_ms=0.0, inventory_latency_ms=0.0, sentiment_latency_ms=0.0,
+                review_scale=1, host="127.0.0.1"):
+    """Start all three stubs on their usual ports and return them keyed by name."""
+    dealers, reviews, cars = load_seed_data(review_scale)
+    stubs = {
+        "backend": backend_stub(dealers, reviews, latency_ms=backend_latency_ms),
+        "inventory": inventory_stub(cars, latency_ms=inventory_latency_ms),
+        "sentiment": sentiment_stub(latency_ms=sentiment_latency_ms),
+    }
+    for stub in stubs.values():
+        stub.host = host
+        stub.start()
+    return stubs
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the upstream stubs until interrupted.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--review-scale", type=int, default=1)
+    args = parser.parse_args()
+    running = start_stubs(args.latency_ms, args.latency_ms, args.latency_ms, args.review_scale)
+    for name, stub in running.items():
+        print(f"{name} stub listening on {stub.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for stub in running.values():
+            stub.stop()
@@ -18,6 +18,7 @@ app.use(express.json());
 // Import Models
 const Reviews = require('./review');
 const Dealerships = require('./dealership');
+const Counters = require('./counter');
 
 // Read data from JSON files
 const reviews_data = JSON.parse(fs.readFileSync("reviews.json", 'utf8'));
@@ -37,6 +38,8 @@ const initializeData = async () => {
     console.log("Initializing Reviews data...");
     await Reviews.deleteMany({});
     await Reviews.insertMany(reviews_data.reviews);
+    const lastId = Math.max(0, ...reviews_data.reviews.map(review => review.id));
+    await Counters.updateOne({ _id: 'reviews' }, { $set: { seq: lastId } }, { upsert: true });
     console.log("Reviews data initialized");
 
     console.log("Initializing Dealerships data...");
@@ -53,10 +56,21 @@ app.get('/', (req, res) => {
 });
 
 // Match with or without trailing slash
+// Optional ?since_id=N&limit=M returns reviews with id > N in id order
+// (incremental pulls for the Django replica)
 app.get(['/fetchReviews', '/fetchReviews/'], async (req, res) => {
+  const { since_id, limit } = req.query;
   try {
     console.log("Received GET request for /fetchReviews");
-    const docs = await Reviews.find();
+    if (since_id === undefined && limit === undefined) {
+      return res.json(await Reviews.find());
+    }
+    const since = since_id === undefined ? 0 : Number(since_id);
+    const max = limit === undefined ? 0 : parseInt(limit, 10);
+    if (!Number.isFinite(since) || Number.isNaN(max) || max < 0) {
+      return res.status(400).json({ error: "'since_id' and 'limit' must be numbers" });
+    }
+    const docs = await Reviews.find({ id: { $gt: since } }).sort({ id: 1 }).limit(max);
     res.json(docs);
   } catch (error) {
     console.error("Error fetching reviews:", error);
@@ -113,31 +127,135 @@ app.get(['/fetchDealer/:id', '/fetchDealer/:id/'], async (req, res) => {
   }
 });
 
+// Reserves `count` consecutive ids in one atomic update and returns the
+// first. Concurrent inserts never share an id, and ids are never reused.
+const allocateIds = async (name, count) => {
+  const counter = await Counters.findOneAndUpdate(
+    { _id: name },
+    { $inc: { seq: count } },
+    { new: true, upsert: true }
+  );
+  return counter.seq - count + 1;
+};
+
+const newReview = (data, id) => new Reviews({
+  id: id,
+  name: data.name,
+  dealership: data.dealership,
+  review: data.review,
+  purchase: data.purchase,
+  purchase_date: data.purchase_date,
+  car_make: data.car_make,
+  car_model: data.car_model,
+  car_year: data.car_year,
+  sentiment: data.sentiment,
+  idempotency_key: data.idempotency_key,
+});
+
 app.post(['/insert_review', '/insert_review/'], async (req, res) => {
   const data = req.body;
   try {
     console.log("Received POST request for /insert_review with data:", data);
-    const docs = await Reviews.find().sort({ id: -1 }).limit(1);
-    let new_id = docs.length > 0 ? docs[0].id + 1 : 1;
-    const review = new Reviews({
-      id: new_id,
-      name: data.name,
-      dealership: data.dealership,
-      review: data.review,
-      purchase: data.purchase,
-      purchase_date: data.purchase_date,
-      car_make: data.car_make,
-      car_model: data.car_model,
-      car_year: data.car_year,
-    });
+    if (data.idempotency_key) {
+      const existing = await Reviews.findOne({ idempotency_key: data.idempotency_key });
+      if (existing) {
+        return res.json(existing);
+      }
+    }
+    const review = newReview(data, await allocateIds('reviews', 1));
     const savedReview = await review.save();
     res.json(savedReview);
   } catch (error) {
+    if (error.code === 11000 && data.idempotency_key) {
+      // A concurrent delivery of the same review won the insert
+      const existing = await Reviews.findOne({ idempotency_key: data.idempotency_key });
+      if (existing) {
+        return res.json(existing);
+      }
+    }
     console.error("Error inserting review:", error);
     res.status(500).json({ error: 'Error inserting review' });
   }
 });
 
+// Body: {"reviews": [{...review...}, ...]}
+// Returns {"reviews": [...]} in request order: the stored review for each
+// item, or null for an item that failed validation. Items whose
+// idempotency_key is already stored return the existing review.
+app.post(['/insert_reviews', '/insert_reviews/'], async (req, res) => {
+  const items = (req.body && req.body.reviews) || [];
+  if (!Array.isArray(items)) {
+    return res.status(400).json({ error: "Expected a 'reviews' list" });
+  }
+  try {
+    console.log(`Received POST request for /insert_reviews with ${items.length} items`);
+    if (items.length === 0) {
+      return res.json({ reviews: [] });
+    }
+    const keys = [...new Set(items.map(item => item.idempotency_key).filter(Boolean))];
+    const known = new Set(keys.length === 0 ? [] : (
+      await Reviews.find({ idempotency_key: { $in: keys } }, { idempotency_key: 1 })
+    ).map(doc => doc.idempotency_key));
+    // Only the first item with a given key is inserted
+    const fresh = items.filter((item, index) => !item.idempotency_key || (
+      !known.has(item.idempotency_key) &&
+      items.findIndex(other => other.idempotency_key === item.idempotency_key) === index));
+    const ids = new Map();
+    if (fresh.length > 0) {
+      const firstId = await allocateIds('reviews', fresh.length);
+      const docs = fresh.map((item, offset) => {
+        ids.set(item, firstId + offset);
+        return newReview(item, firstId + offset);
+      });
+      try {
+        await Reviews.insertMany(docs, { ordered: false });
+      } catch (error) {
+        // Duplicate keys: a concurrent delivery stored the review first
+        const writeErrors = [].concat(error.writeErrors || []);
+        if (writeErrors.length === 0 || writeErrors.some(writeError => writeError.code !== 11000)) {
+          throw error;
+        }
+      }
+    }
+    const stored = await Reviews.find({
+      $or: [{ id: { $in: [...ids.values()] } }, { idempotency_key: { $in: keys } }],
+    });
+    const byId = new Map(stored.map(doc => [doc.id, doc]));
+    const byKey = new Map(stored.filter(doc => doc.idempotency_key).map(doc => [doc.idempotency_key, doc]));
+    res.json({
+      reviews: items.map(item => (item.idempotency_key ?
+        byKey.get(item.idempotency_key) : byId.get(ids.get(item))) || null),
+    });
+  } catch (error) {
+    console.error("Error inserting reviews:", error);
+    res.status(500).json({ error: 'Error inserting reviews' });
+  }
+});
+
+// Body: {"sentiments": [{"id": 1, "sentiment": "positive"}, ...]}
+app.post(['/update_sentiments', '/update_sentiments/'], async (req, res) => {
+  const items = (req.body && req.body.sentiments) || [];
+  if (!Array.isArray(items)) {
+    return res.status(400).json({ error: "Expected a 'sentiments' list" });
+  }
+  try {
+    console.log(`Received POST request for /update_sentiments with ${items.length} items`);
+    if (items.length === 0) {
+      return res.json({ matched: 0, modified: 0 });
+    }
+    const result = await Reviews.bulkWrite(items.map(item => ({
+      updateOne: {
+        filter: { id: item.id },
+        update: { $set: { sentiment: item.sentiment } },
+      },
+    })), { ordered: false });
+    res.json({ matched: result.matchedCount, modified: result.modifiedCount });
+  } catch (error) {
+    console.error("Error updating sentiments:", error);
+    res.status(500).json({ error: 'Error updating sentiments' });
+  }
+});
+
 // Fallback route for unmatched endpoints
 app.use((req, res, next) => {
   res.status(404).json({ error: "Route not found" });
@@ -0,0 +1,11 @@
+/* jshint esversion: 6 */
+const mongoose = require('mongoose');
+const Schema = mongoose.Schema;
+
+// One document per id sequence: { _id: 'reviews', seq: <last id handed out> }
+const counters = new Schema({
+  _id: { type: String, required: true },
+  seq: { type: Number, required: true, default: 0 },
+}, { versionKey: false });
+
+module.exports = mongoose.model('counters', counters);
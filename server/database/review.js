@@ -12,6 +12,15 @@ const reviews = new Schema({
   car_make: { type: String, required: true },
   car_model: { type: String, required: true },
   car_year: { type: Number, required: true },
+  // Computed by the Django app when the review is written (or backfilled)
+  sentiment: { type: String, enum: ['positive', 'negative', 'neutral'] },
+  // Set by the Django review outbox so a redelivered review is stored once
+  idempotency_key: { type: String },
 });
 
+// Ids come from the 'reviews' counter (see allocateIds in app.js); the
+// unique index also serves the replica's since_id range scans
+reviews.index({ id: 1 }, { unique: true });
+reviews.index({ idempotency_key: 1 }, { unique: true, sparse: true });
+
 module.exports = mongoose.model('reviews', reviews);
@@ -1,6 +1,8 @@
 # djangoapp/admin.py
 from django.contrib import admin
-from .models import CarMake, CarModel
+from .models import (
+    CarMake, CarModel, DealerReviewStats, PendingReview, ReplicaDealer, ReplicaReview,
+)
 
 
 class CarModelInline(admin.TabularInline):
@@ -40,3 +42,59 @@ class CarMakeAdmin(admin.ModelAdmin):
     search_fields = ('name',)  # Enable search by car make name
     inlines = [CarModelInline]  # Inline CarModel editing within CarMake admin
     list_per_page = 10  # Display 10 items per page for easy browsing
+
+
+@admin.register(DealerReviewStats)
+class DealerReviewStatsAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the per-dealer review aggregates.
+    They are maintained by add_review and manage.py rebuild_review_stats.
+    """
+    list_display = ('dealer_id', 'review_count', 'positive_count', 'neutral_count',
+                    'negative_count', 'last_review_at')
+    search_fields = ('dealer_id',)
+    ordering = ['dealer_id']
+    list_per_page = 20
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """Rows the app writes itself (replica sync, add_review, the review outbox)."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ReplicaDealer)
+class ReplicaDealerAdmin(ReadOnlyAdmin):
+    list_display = ('id', 'full_name', 'city', 'state', 'synced_at')
+    list_filter = ('state',)
+    search_fields = ('full_name', 'city')
+    ordering = ['id']
+    list_per_page = 20
+
+
+@admin.register(ReplicaReview)
+class ReplicaReviewAdmin(ReadOnlyAdmin):
+    list_display = ('id', 'dealership', 'name', 'car_make', 'car_model', 'sentiment')
+    list_filter = ('sentiment',)
+    search_fields = ('dealership', 'name', 'review')
+    ordering = ['-id']
+    list_per_page = 20
+
+
+@admin.register(PendingReview)
+class PendingReviewAdmin(ReadOnlyAdmin):
+    list_display = ('idempotency_key', 'username', 'dealer_id', 'status', 'attempts',
+                    'next_attempt_at', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('idempotency_key', 'username')
+    ordering = ['-id']
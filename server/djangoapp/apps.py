@@ -1,6 +1,24 @@
 # djangoapp/apps.py
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+
+def install_query_timer(sender, connection, **kwargs):
+    # Count queries per request for the timing middleware
+    from .metrics import db_execute_wrapper
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
 
 
 class DjangoappConfig(AppConfig):
     name = 'djangoapp'
+
+    def ready(self):
+        connection_created.connect(install_query_timer, dispatch_uid="djangoapp_query_timer")
+        from . import signals  # noqa: F401 -- registers the catalog snapshot receivers
+        from . import outbox
+        if outbox.enabled():
+            # Started by the first request, so only serving processes deliver
+            request_started.connect(outbox.start_on_first_request,
+                                    dispatch_uid=outbox.WORKER_DISPATCH_UID)
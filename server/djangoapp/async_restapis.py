@@ -0,0 +1,231 @@
+# djangoapp/async_restapis.py
+
+import asyncio
+import copy
+import json
+import logging
+import time
+import weakref
+
+import httpx
+from asgiref.sync import sync_to_async
+
+from . import metrics, resilience
+from .resilience import CircuitOpenError
+from .restapis import (
+    backend_url,
+    upstream_name,
+    url_template,
+    sentiment_batch_url,
+    http_pool_connections,
+    http_pool_maxsize,
+    sentiment_cache,
+    embedded_sentiment_engine,
+    split_cached_sentiments,
+    sentiment_chunks,
+    parse_sentiment_batch,
+    missing_review_fields,
+    with_sentiment,
+    searchcars_request_url,
+    single_flight,
+    record_stream_call,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+# httpx.AsyncClient is bound to the event loop it first runs on, so keep one
+# pooled client per loop (a single loop under uvicorn).
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(
+                max_connections=http_pool_connections * http_pool_maxsize,
+                max_keepalive_connections=http_pool_maxsize,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def send(method, url, **kwargs):
+    """Async counterpart of ``restapis.send``, sharing its circuit breakers."""
+    upstream = resilience.upstream(upstream_name(url))
+    attempts = resilience.attempts_for(method)
+    for attempt in range(1, attempts + 1):
+        timeout = upstream.before_call(url_template(url))
+        started = time.perf_counter()
+        status, nbytes = 0, 0
+        try:
+            response = await get_client().request(
+                method, url, **dict({"timeout": timeout}, **kwargs))
+            status, nbytes = response.status_code, len(response.content)
+        except httpx.HTTPError:
+            if attempt == attempts:
+                raise
+        finally:
+            duration = time.perf_counter() - started
+            metrics.record_upstream(
+                upstream.name, method, url_template(url), status, nbytes, duration)
+            upstream.after_call(url_template(url), not resilience.is_failure(status), duration)
+        if not resilience.is_failure(status) or attempt == attempts:
+            return response
+        delay = resilience.backoff(attempt)
+        logger.warning(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt} failed)")
+        await asyncio.sleep(delay)
+
+
+async def stream_get(url):
+    """Async counterpart of ``restapis.stream_get``; returns an async iterator or None."""
+    upstream = resilience.upstream(upstream_name(url))
+    logger.info(f"Async streaming GET from {url}")
+    started = time.perf_counter()
+    try:
+        timeout = upstream.before_call(url_template(url))
+        client = get_client()
+        response = await client.send(client.build_request("GET", url, timeout=timeout), stream=True)
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        record_stream_call(upstream, url, 0, 0, started)
+        logger.error(f"Error starting async streamed GET to {url}: {e}")
+        return None
+    if response.status_code >= 400:
+        await response.aclose()
+        record_stream_call(upstream, url, response.status_code, 0, started)
+        logger.error(f"Async streamed GET to {url} failed with status {response.status_code}")
+        return None
+    return _stream_chunks(upstream, url, response, started)
+
+
+async def _stream_chunks(upstream, url, response, started):
+    status = response.status_code
+    try:
+        async for text in response.aiter_text():
+            yield text
+    except httpx.HTTPError:
+        status = 0
+        raise
+    finally:
+        await response.aclose()
+        record_stream_call(upstream, url, status, response.num_bytes_downloaded, started)
+
+# In-flight tasks per event loop, keyed like restapis.single_flight
+_flights = weakref.WeakKeyDictionary()
+
+
+async def coalesce(key, fn):
+    """
+    Async single-flight: concurrent awaits with the same key share one
+    ``fn()`` task and each get a deep copy of its result. A cancelled
+    caller does not cancel the shared task.
+    """
+    flights = _flights.setdefault(asyncio.get_running_loop(), {})
+    task = flights.get(key)
+    if task is None:
+        task = flights[key] = asyncio.ensure_future(fn())
+        task.add_done_callback(lambda _: flights.pop(key, None))
+    else:
+        single_flight.shared += 1
+    return copy.deepcopy(await asyncio.shield(task))
+
+
+async def get_request(url, **kwargs):
+    return await coalesce(("GET", url, tuple(sorted(kwargs.items()))),
+                          lambda: _get_request(url, **kwargs))
+
+
+async def _get_request(url, **kwargs):
+    try:
+        logger.info(f"Making async GET request to URL: {url}")
+        response = await send("GET", url, params=kwargs)
+        response.raise_for_status()
+        logger.debug(f"Async GET request successful. Status Code: {response.status_code}")
+        return response.json()
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        logger.error(f"Error making async GET request to {url}: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error for async GET request to {url}: {e}")
+        return None
+
+
+async def _score_batch(texts):
+    logger.info(f"Async batch sentiment request to {sentiment_batch_url} ({len(texts)} texts)")
+    try:
+        response = await send("POST", sentiment_batch_url, json={"texts": texts})
+        response.raise_for_status()
+        return parse_sentiment_batch(response.json(), len(texts))
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        logger.error(f"Async batch sentiment analysis failed: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error for async batch sentiment analysis: {e}")
+        return None
+
+
+async def analyze_review_sentiments_batch(texts):
+    """Async counterpart of ``restapis.analyze_review_sentiments_batch``."""
+    texts = list(texts)
+    if not texts:
+        return []
+    engine = embedded_sentiment_engine()
+    if engine is not None:
+        return await sync_to_async(engine.label_many, thread_sensitive=False)(texts)
+    keys, labels, pending = await sync_to_async(split_cached_sentiments)(texts)
+    if pending:
+        chunks = sentiment_chunks(list(pending.values()))
+        results = await asyncio.gather(*(_score_batch(chunk) for chunk in chunks))
+        if any(result is None for result in results):
+            return None
+        scored = [label for result in results for label in result]
+        fresh = dict(zip(pending.keys(), scored))
+        await sync_to_async(sentiment_cache.set_many)(fresh)
+        labels.update(fresh)
+    return [labels[key] for key in keys]
+
+
+async def post_review(data_dict):
+    request_url = f"{backend_url}/insert_review"  # No trailing slash
+    logger.info(f"Async POST to {request_url} with data {data_dict}")
+    missing_fields = missing_review_fields(data_dict)
+    if missing_fields:
+        logger.error(f"Validation error: Missing fields - {missing_fields}")
+        return {
+            "status": "Failed",
+            "message": f"Missing required fields: {', '.join(missing_fields)}"
+        }
+    labels = await analyze_review_sentiments_batch([data_dict["review"]])
+    data_dict = with_sentiment(data_dict, labels)
+    try:
+        response = await send("POST", request_url, json=data_dict)
+        response.raise_for_status()
+        logger.debug(f"Async POST request successful. Status Code: {response.status_code}")
+        return response.json()
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        logger.error(f"Failed to post review: {e}")
+        return {"status": "Failed", "message": "Network exception occurred"}
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error for async POST request to {request_url}: {e}")
+        return {"status": "Failed", "message": "Invalid JSON response"}
+
+
+async def searchcars_request(endpoint, **kwargs):
+    request_url = searchcars_request_url(endpoint, **kwargs)
+    logger.info(f"Async GET from {request_url}")
+    try:
+        response = await send("GET", request_url)
+        return response.json()
+    except (httpx.HTTPError, CircuitOpenError, json.JSONDecodeError) as e:
+        logger.error(f"Network exception occurred: {e}")
+        return None
@@ -0,0 +1,206 @@
+# djangoapp/async_views.py
+#
+# Async counterparts of the backend-bound views in views.py. They are routed
+# in place of the sync views when settings.ASYNC_VIEWS is on, which is meant
+# for the ASGI (uvicorn) deployment mode.
+
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+
+from . import async_restapis, dealer_cache, outbox, replica, streaming
+from .pagination import InvalidQuery
+from .restapis import backend_url, searchcars_request_url, sentiment_batch_size, unscored_reviews
+from .views import (
+    json_response,
+    dealers_payload,
+    nearby_response,
+    record_replica_review,
+    record_review_stats,
+    review_texts,
+    attach_sentiments,
+    inventory_endpoint,
+    dealer_page_response,
+    queued_review_response,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+# ===== Dealer Views =====
+
+
+async def fetch_dealers(request, state="All"):
+    logger.info(f"Fetching dealerships for state: {state}")
+    try:
+        dealers = await dealer_cache.aget_dealers(state)
+        if dealers is not None:
+            logger.info(f"Retrieved {len(dealers)} dealers.")
+            fmt = streaming.stream_format(request)
+            payload = await sync_to_async(dealers_payload)(dealers, request.GET)
+            if fmt is None:
+                return json_response(payload)
+            # An async iterator, so ASGI streams the body instead of buffering it
+            items = streaming.aiter_list(payload.pop("dealers"))
+            return streaming.streaming_response(items, fmt, "dealers", payload)
+        logger.error("Failed to fetch dealers from backend API.")
+        return json_response({"status": 500, "error": "Failed to fetch dealers"}, status=500)
+    except InvalidQuery as exc:
+        return json_response({"status": 400, "error": str(exc)}, status=400)
+    except Exception:
+        logger.exception("Exception in fetch_dealers")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
+
+
+async def fetch_nearby_dealers(request):
+    try:
+        return await sync_to_async(nearby_response)(request.GET)
+    except Exception:
+        logger.exception("Exception in fetch_nearby_dealers")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
+
+
+async def get_dealer_details(request, dealer_id):
+    logger.info(f"Fetching dealer details for ID: {dealer_id}")
+    try:
+        dealer = await dealer_cache.aget_dealer(dealer_id)
+        if dealer is not None:
+            logger.info(f"Dealer details retrieved for ID: {dealer_id}")
+            return json_response({"status": 200, "dealer": dealer})
+        logger.warning(f"Dealer with ID {dealer_id} not found.")
+        return json_response({"status": 404, "error": "Dealer not found"}, status=404)
+    except Exception:
+        logger.exception("Exception in get_dealer_details")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
+
+
+async def fetch_scored_reviews(dealer_id):
+    return await async_restapis.coalesce(
+        ("scored_reviews", str(dealer_id)), lambda: _fetch_scored_reviews(dealer_id))
+
+
+async def _fetch_scored_reviews(dealer_id):
+    if replica.enabled():
+        reviews = await sync_to_async(replica.dealer_reviews)(dealer_id)
+    else:
+        reviews = await async_restapis.get_request(f"{backend_url}/fetchReviews/dealer/{dealer_id}")
+    if reviews is not None:
+        unscored = unscored_reviews(reviews)
+        if unscored:
+            labels = await async_restapis.analyze_review_sentiments_batch(review_texts(unscored))
+            attach_sentiments(unscored, labels)
+    return reviews
+
+
+async def score_review_batches(reviews):
+    """Async counterpart of ``views.score_review_batches``."""
+    async for batch in streaming.abatched(reviews, sentiment_batch_size):
+        unscored = unscored_reviews(batch)
+        if unscored:
+            labels = await async_restapis.analyze_review_sentiments_batch(review_texts(unscored))
+            attach_sentiments(unscored, labels)
+        for review in batch:
+            yield review
+
+
+async def get_dealer_reviews(request, dealer_id):
+    logger.info(f"Fetching reviews for dealer ID: {dealer_id}")
+    try:
+        fmt = streaming.stream_format(request)
+        if fmt is not None and replica.enabled():
+            reviews = score_review_batches(replica.aiter_dealer_reviews(dealer_id))
+            return streaming.streaming_response(reviews, fmt, "reviews")
+        if fmt is not None:
+            chunks = await async_restapis.stream_get(
+                f"{backend_url}/fetchReviews/dealer/{dealer_id}")
+            if chunks is not None:
+                reviews = score_review_batches(streaming.aiter_json_array(chunks))
+                return streaming.streaming_response(reviews, fmt, "reviews")
+        else:
+            reviews = await fetch_scored_reviews(dealer_id)
+            if reviews is not None:
+                logger.info(f"Retrieved {len(reviews)} reviews for dealer ID: {dealer_id}")
+                return json_response({"status": 200, "reviews": reviews})
+        logger.warning(f"No reviews found for dealer ID {dealer_id}.")
+        return json_response({"status": 404, "error": "No reviews found"}, status=404)
+    except InvalidQuery as exc:
+        return json_response({"status": 400, "error": str(exc)}, status=400)
+    except Exception:
+        logger.exception("Exception in get_dealer_reviews")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
+
+
+async def get_dealer_page(request, dealer_id):
+    logger.info(f"Fetching full dealer page for ID: {dealer_id}")
+    try:
+        dealer, reviews, cars = await asyncio.gather(
+            dealer_cache.aget_dealer(dealer_id),
+            fetch_scored_reviews(dealer_id),
+            async_restapis.searchcars_request(f"/cars/{dealer_id}"),
+            return_exceptions=True,
+        )
+        parts = [None if isinstance(part, Exception) else part for part in (dealer, reviews, cars)]
+        return dealer_page_response(dealer_id, *parts)
+    except Exception:
+        logger.exception("Exception in get_dealer_page")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
+
+# ===== Review Submission View =====
+
+
+@csrf_exempt
+async def add_review(request):
+    if request.method != "POST":
+        logger.warning("add_review called with invalid request method.")
+        return json_response({"status": 405, "message": "Method Not Allowed"}, status=405)
+    user = await request.auser()
+    if not user.is_authenticated:
+        logger.warning("Unauthorized add_review attempt.")
+        return json_response({"status": 403, "message": "Unauthorized"}, status=403)
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        logger.error("JSON decode error in add_review")
+        return json_response({"status": 400, "message": "Invalid JSON format"}, status=400)
+    if outbox.enabled():
+        return await sync_to_async(queued_review_response)(
+            data, user.username, request.headers.get("Idempotency-Key"))
+    try:
+        response = await async_restapis.post_review(data)
+        if response and "id" in response:
+            logger.info(f"Review posted successfully by user '{user.username}'.")
+            await sync_to_async(record_review_stats)(response)
+            await sync_to_async(record_replica_review)(response)
+            return json_response({"status": 200, "message": "Review posted successfully"})
+        logger.error("Failed to post review via backend API. Response: " + str(response))
+        return json_response({"status": 500, "message": "Error in posting review"}, status=500)
+    except Exception:
+        logger.exception("Exception in add_review")
+        return json_response({"status": 500, "message": "Internal Server Error"}, status=500)
+
+
+async def get_inventory(request, dealer_id):
+    if dealer_id:
+        try:
+            fmt = streaming.stream_format(request)
+        except InvalidQuery as exc:
+            return json_response({"status": 400, "error": str(exc)}, status=400)
+        endpoint = inventory_endpoint(dealer_id, request.GET)
+        if fmt is not None:
+            chunks = await async_restapis.stream_get(searchcars_request_url(endpoint))
+            if chunks is None:
+                return json_response(
+                    {"status": 500, "error": "Failed to fetch inventory"}, status=500)
+            return streaming.streaming_response(streaming.aiter_json_array(chunks), fmt, "cars")
+        cars = await async_restapis.searchcars_request(endpoint)
+        return json_response({"status": 200, "cars": cars})
+    return json_response({"status": 400, "message": "Bad Request"})
@@ -0,0 +1,133 @@
+# djangoapp/catalog.py
+#
+# Precomputed get_cars payload. The serialized CarModels JSON and its ETag
+# are kept in the default cache under the current CatalogVersion, which
+# model signals (see signals.py) bump in the same transaction as each
+# catalog change. Serving the catalog costs one primary-key read of the
+# version; a worker whose cache lacks the current version's snapshot (its
+# per-process cache, or another worker made the edit) rebuilds it once.
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+
+from .models import CarModel, CatalogVersion
+from .pagination import InvalidQuery, parse_fields, parse_int, parse_page
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+VERSION_ID = 1
+
+# Public field name -> ORM lookup for ``fields=`` projection
+FIELDS = {
+    "id": "id",
+    "CarModel": "name",
+    "CarMake": "car_make__name",
+    "type": "type",
+    "year": "year",
+    "dealer_id": "dealer_id",
+}
+DEFAULT_FIELDS = ["CarModel", "CarMake"]
+FILTERS = {"make", "type", "year_min", "year_max"}
+
+
+def serialize(rows):
+    return [{"CarModel": name, "CarMake": make} for name, make in rows]
+
+
+def snapshot_key(version):
+    return f"catalog:snapshot:v{version}"
+
+
+def current_version():
+    version = (CatalogVersion.objects.filter(pk=VERSION_ID)
+               .values_list("version", flat=True).first())
+    return version or 0
+
+
+def bump_version():
+    """Mark the catalog changed; takes effect when the current transaction commits."""
+    if not CatalogVersion.objects.filter(pk=VERSION_ID).update(version=F("version") + 1):
+        CatalogVersion.objects.create(pk=VERSION_ID, version=1)
+
+
+def rebuild(version=None):
+    """Serialize the whole catalog and store it as the snapshot for ``version``."""
+    if version is None:
+        version = current_version()
+    # Plain tuples: no model instances or datetime conversion for large catalogs
+    cars = serialize(CarModel.objects.order_by("id").values_list("name", "car_make__name"))
+    body = json.dumps({"CarModels": cars}, cls=DjangoJSONEncoder).encode("utf-8")
+    snapshot = {
+        "body": body,
+        "etag": f'"{version}-{hashlib.sha1(body).hexdigest()}"',
+        "count": len(cars),
+        "version": version,
+    }
+    cache.set(snapshot_key(version), snapshot, timeout=settings.CATALOG_SNAPSHOT_TTL)
+    logger.info(f"Rebuilt catalog snapshot v{version} with {len(cars)} car models.")
+    return snapshot
+
+
+def get_snapshot():
+    version = current_version()
+    snapshot = cache.get(snapshot_key(version))
+    if snapshot is None:
+        snapshot = rebuild(version)
+    return snapshot
+
+
+def schedule_rebuild():
+    """
+    Bump the catalog version and, once the current transaction commits,
+    build this worker's snapshot for it. Repeated calls inside one
+    transaction (e.g. a cascading delete) build it only once.
+    """
+    bump_version()
+    transaction.on_commit(get_snapshot)
+
+
+def _car_type(value):
+    for key, label in CarModel.CAR_TYPES:
+        if value.lower() in (key.lower(), label.lower()):
+            return key
+    raise InvalidQuery(f"Unknown type '{value}'")
+
+
+def query(params):
+    """
+    One keyset page of the catalog, filtered in the database by ``make``,
+    ``type`` and ``year_min``/``year_max``. Returns ``(rows, next_cursor)``.
+    """
+    cursor, limit = parse_page(params)
+    fields = parse_fields(params, FIELDS, DEFAULT_FIELDS)
+    queryset = CarModel.objects.filter(id__gt=cursor)
+    if params.get("make"):
+        queryset = queryset.filter(car_make__name__iexact=params["make"])
+    if params.get("type"):
+        queryset = queryset.filter(type=_car_type(params["type"]))
+    year_min = parse_int(params, "year_min")
+    year_max = parse_int(params, "year_max")
+    if year_min is not None:
+        queryset = queryset.filter(year__gte=year_min)
+    if year_max is not None:
+        queryset = queryset.filter(year__lte=year_max)
+    lookups = [FIELDS[field] for field in fields]
+    if "id" not in lookups:
+        lookups.append("id")
+    rows = list(queryset.order_by("id").values(*lookups)[:limit + 1])
+    next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+    return [{field: row[FIELDS[field]] for field in fields} for row in rows[:limit]], next_cursor
@@ -0,0 +1,201 @@
+# djangoapp/dealer_cache.py
+#
+# TTL cache in front of the dealer list/detail proxies to the Node API.
+# Entries live in the "dealers" cache alias (files shared by every worker on
+# the host by default, or SQLite/Redis, see settings.CACHES), so
+# manage.py invalidate_dealer_cache reaches the web workers. A stale entry
+# is served while one caller refreshes it in the background. With
+# settings.REPLICA_MODE on, reads go to the local replica tables instead.
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections
+
+from . import replica
+from .restapis import backend_url, get_request
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+CACHE_ALIAS = "dealers"
+GENERATION_KEY = "generation"
+LIST_VERSION_KEY = "list_version"
+REFRESH_LOCK_TIMEOUT = 30
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dealer-cache")
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def is_process_local():
+    """True when each process has its own copy of the cache (LocMem)."""
+    return isinstance(_cache(), LocMemCache)
+
+
+def _generation():
+    return _cache().get(GENERATION_KEY, 1)
+
+
+def list_version():
+    """Bumped on every invalidation; geo rebuilds its index when it changes."""
+    return _cache().get(LIST_VERSION_KEY, 0)
+
+
+def _key_part(value):
+    # States such as "New York" contain spaces, which cache keys must not
+    return quote(str(value), safe="")
+
+
+def dealers_key(state="All"):
+    return f"v{_generation()}:dealers:{_key_part(state)}"
+
+
+def dealer_key(dealer_id):
+    return f"v{_generation()}:dealer:{_key_part(dealer_id)}"
+
+
+def lookup(key):
+    """
+    Return ``(data, fresh)`` for a cached entry, or ``(None, False)`` on a
+    miss. ``fresh`` is False once the entry is older than its TTL.
+    """
+    entry = _cache().get(key)
+    if entry is None:
+        return None, False
+    return entry["data"], time.time() < entry["expires_at"]
+
+
+def store(key, data, ttl):
+    entry = {"data": data, "expires_at": time.time() + ttl}
+    _cache().set(key, entry, timeout=ttl + settings.DEALER_CACHE_STALE_TTL)
+
+
+def claim_refresh(key):
+    """True for exactly one caller per stale entry (across processes on shared backends)."""
+    return _cache().add(f"{key}:refresh", True, timeout=REFRESH_LOCK_TIMEOUT)
+
+
+def _refresh(key, url, ttl):
+    # Runs on an executor thread, which owns its database connection (a
+    # database cache backend), so it is recycled as a request thread's would be
+    close_old_connections()
+    try:
+        data = get_request(url)
+        if data is not None:
+            store(key, data, ttl)
+        _cache().delete(f"{key}:refresh")
+    finally:
+        close_old_connections()
+
+
+def cached_get_request(key, url, ttl):
+    data, fresh = lookup(key)
+    if data is not None:
+        if not fresh and claim_refresh(key):
+            logger.info(f"Serving stale {key} while refreshing it")
+            _refresh_executor.submit(_refresh, key, url, ttl)
+        return data
+    data = get_request(url)
+    if data is not None:
+        store(key, data, ttl)
+    return data
+
+
+async def acached_get_request(key, url, ttl):
+    # Imported lazily: httpx is only needed in ASGI mode
+    from .async_restapis import get_request as aget_request
+    data, fresh = await sync_to_async(lookup)(key)
+    if data is not None:
+        if not fresh and await sync_to_async(claim_refresh)(key):
+            logger.info(f"Serving stale {key} while refreshing it")
+            _refresh_executor.submit(_refresh, key, url, ttl)
+        return data
+    data = await aget_request(url)
+    if data is not None:
+        await sync_to_async(store)(key, data, ttl)
+    return data
+
+
+def _dealers_url(state):
+    if state != "All":
+        return f"{backend_url}/fetchDealers/{state}"  # No trailing slash
+    return f"{backend_url}/fetchDealers"
+
+
+def _dealer_url(dealer_id):
+    return f"{backend_url}/fetchDealer/{dealer_id}"  # No trailing slash
+
+
+def get_dealers(state="All"):
+    if replica.enabled():
+        return replica.dealers(state)
+    return cached_get_request(
+        dealers_key(state), _dealers_url(state), settings.DEALER_CACHE_TTLS["dealers"])
+
+
+def get_dealer(dealer_id):
+    if replica.enabled():
+        return replica.dealer(dealer_id)
+    return cached_get_request(
+        dealer_key(dealer_id), _dealer_url(dealer_id), settings.DEALER_CACHE_TTLS["dealer"])
+
+
+async def aget_dealers(state="All"):
+    if replica.enabled():
+        return await sync_to_async(replica.dealers)(state)
+    key = await sync_to_async(dealers_key)(state)
+    return await acached_get_request(
+        key, _dealers_url(state), settings.DEALER_CACHE_TTLS["dealers"])
+
+
+async def aget_dealer(dealer_id):
+    if replica.enabled():
+        return await sync_to_async(replica.dealer)(dealer_id)
+    key = await sync_to_async(dealer_key)(dealer_id)
+    return await acached_get_request(
+        key, _dealer_url(dealer_id), settings.DEALER_CACHE_TTLS["dealer"])
+
+
+def invalidate(state=None, dealer_id=None):
+    """
+    Drop cached dealer responses. With ``state`` only that state's list (and
+    the full list) is dropped; with ``dealer_id`` that dealer, its state's
+    list and the full list. With neither, every entry is invalidated.
+    """
+    cache = _cache()
+    if state is None and dealer_id is None:
+        generation = _generation() + 1
+        cache.set(GENERATION_KEY, generation, timeout=None)
+        logger.info(f"Invalidated all cached dealer responses (generation {generation})")
+        _bump_list_version()
+        return
+    keys = [dealers_key("All")]
+    if dealer_id is not None:
+        cached, _ = lookup(dealer_key(dealer_id))
+        if cached and cached.get("state"):
+            keys.append(dealers_key(cached["state"]))
+        keys.append(dealer_key(dealer_id))
+    if state is not None:
+        keys.append(dealers_key(state))
+    cache.delete_many(keys)
+    logger.info(f"Invalidated cached dealer responses: {keys}")
+    _bump_list_version()
+
+
+def _bump_list_version():
+    _cache().set(LIST_VERSION_KEY, list_version() + 1, timeout=None)
@@ -0,0 +1,143 @@
+# djangoapp/geo.py
+#
+# In-memory spatial index over the dealer set for /api/dealers/nearby/.
+# Dealers are placed on the unit sphere as 3-D vectors in a k-d tree; the
+# straight-line (chord) distance between two such vectors grows
+# monotonically with their great-circle distance, so nearest-neighbour and
+# radius queries on the tree are exact. The index is built from the cached
+# dealer list (dealer_cache) and rebuilt when that list changes, so queries
+# never call the Node backend.
+
+import heapq
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from . import dealer_cache
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_vector(lat, lon):
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def km_to_chord(km):
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+class _Node:
+    __slots__ = ("point", "item", "axis", "left", "right")
+
+    def __init__(self, point, item, axis, left, right):
+        self.point = point
+        self.item = item
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class DealerIndex:
+    """k-d tree over dealers that have a valid ``lat``/``long``."""
+
+    def __init__(self, dealers):
+        entries = []
+        for dealer in dealers:
+            try:
+                lat, lon = float(dealer["lat"]), float(dealer["long"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                entries.append((to_vector(lat, lon), dealer))
+        self.size = len(entries)
+        self.root = self._build(entries, 0)
+
+    def _build(self, entries, depth):
+        if not entries:
+            return None
+        axis = depth % 3
+        entries.sort(key=lambda entry: entry[0][axis])
+        middle = len(entries) // 2
+        point, item = entries[middle]
+        return _Node(point, item, axis,
+                     self._build(entries[:middle], depth + 1),
+                     self._build(entries[middle + 1:], depth + 1))
+
+    def nearest(self, lat, lon, k=10, radius_km=None):
+        """
+        Up to ``k`` dealers closest to (lat, lon), optionally within
+        ``radius_km``, as ``(distance_km, dealer)`` pairs, nearest first.
+        """
+        if k <= 0 or self.root is None:
+            return []
+        target = to_vector(lat, lon)
+        bound = km_to_chord(radius_km) if radius_km is not None else math.inf
+        best = []  # max-heap of (-chord, tiebreak, item)
+        counter = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            chord = math.dist(target, node.point)
+            limit = -best[0][0] if len(best) == k else bound
+            if chord <= bound and chord < limit:
+                counter += 1
+                heapq.heappush(best, (-chord, counter, node.item))
+                if len(best) > k:
+                    heapq.heappop(best)
+            diff = target[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            limit = -best[0][0] if len(best) == k else bound
+            # Visit the far side only if the splitting plane is within reach
+            if abs(diff) <= limit:
+                stack.append(far)
+            stack.append(near)
+        return [(chord_to_km(-chord), item) for chord, _, item in sorted(best, reverse=True)]
+
+
+_index = None
+_fingerprint = None
+_checked_at = 0.0
+_list_version = None
+_lock = threading.Lock()
+
+
+def _fingerprint_of(dealers):
+    return hash(tuple((d.get("id"), d.get("lat"), d.get("long")) for d in dealers))
+
+
+def get_index():
+    """
+    The current index. The cached dealer list is re-read at most once per
+    dealer-list TTL, or sooner after a dealer cache invalidation in any
+    process, and the tree rebuilt only if ids or coordinates changed.
+    Returns None if the dealer list is unavailable and no index exists yet.
+    """
+    global _index, _fingerprint, _checked_at, _list_version
+    ttl = settings.DEALER_CACHE_TTLS["dealers"]
+    version = dealer_cache.list_version()
+
+    def current():
+        return (_index is not None and _list_version == version
+                and time.monotonic() - _checked_at < ttl)
+
+    if current():
+        return _index
+    with _lock:
+        if current():
+            return _index
+        dealers = dealer_cache.get_dealers("All")
+        if dealers is not None:
+            fingerprint = _fingerprint_of(dealers)
+            if fingerprint != _fingerprint:
+                _index, _fingerprint = DealerIndex(dealers), fingerprint
+            _checked_at, _list_version = time.monotonic(), version
+        return _index
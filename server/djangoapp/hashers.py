@@ -0,0 +1,17 @@
+# djangoapp/hashers.py
+
+import os
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with a low, configurable iteration count
+    (PASSWORD_HASH_ITERATIONS) for load-test environments, selected with
+    PASSWORD_HASHER_PROFILE=fast. Not for production: hashes are cheap to
+    brute-force. A separate algorithm name keeps them distinguishable, and
+    Django rehashes them on the next login once the profile is switched back.
+    """
+    algorithm = "pbkdf2_sha256_fast"
+    iterations = int(os.getenv("PASSWORD_HASH_ITERATIONS", "10000"))
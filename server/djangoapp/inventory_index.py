@@ -0,0 +1,154 @@
+# djangoapp/inventory_index.py
+#
+# Local, indexed snapshot of the car inventory (the car_records.json that the
+# carsInventory service loads) for multi-criteria search. Categorical fields
+# (dealer, make, model, body type) have inverted indexes; numeric fields
+# (year, mileage, price) have sorted indexes for range lookups and ordering.
+# The snapshot is reloaded when the file changes.
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+
+from .pagination import MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE, InvalidQuery, parse_int
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+# Query parameter -> record field
+CATEGORICAL = {"dealer_id": "dealer_id", "make": "make", "model": "model", "body_type": "bodyType"}
+NUMERIC = {"year": "year", "mileage": "mileage", "price": "price"}
+RELOAD_CHECK_SECONDS = 30
+
+
+def _norm(value):
+    return str(value).strip().lower()
+
+
+class InventoryIndex:
+    def __init__(self, cars):
+        self.cars = cars
+        self.inverted = {param: {} for param in CATEGORICAL}
+        for position, car in enumerate(cars):
+            for param, field in CATEGORICAL.items():
+                self.inverted[param].setdefault(_norm(car.get(field, "")), []).append(position)
+        # (value, position) pairs in ascending order, split into parallel lists for bisect
+        self.sorted = {}
+        for param, field in NUMERIC.items():
+            pairs = sorted((car[field], position) for position, car in enumerate(cars)
+                           if isinstance(car.get(field), (int, float)))
+            self.sorted[param] = ([value for value, _ in pairs],
+                                  [position for _, position in pairs])
+
+    def _range(self, param, low, high):
+        values, positions = self.sorted[param]
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return positions[start:end]
+
+    def search(self, criteria, ranges, sort="price", descending=False, offset=0,
+               limit=DEFAULT_PAGE_SIZE):
+        """
+        ``criteria`` maps categorical params to lists of accepted values,
+        ``ranges`` maps numeric params to ``(low, high)`` (either may be None).
+        Returns ``(total, cars)`` for one page of the matches ordered by
+        ``sort``.
+        """
+        candidate_lists = []
+        for param, values in criteria.items():
+            index = self.inverted[param]
+            candidate_lists.append([pos for value in values for pos in index.get(_norm(value), [])])
+        for param, (low, high) in ranges.items():
+            candidate_lists.append(self._range(param, low, high))
+        if candidate_lists:
+            candidate_lists.sort(key=len)
+            matches = set(candidate_lists[0])
+            for positions in candidate_lists[1:]:
+                if not matches:
+                    break
+                matches.intersection_update(positions)
+        else:
+            matches = None
+
+        values, positions = self.sorted[sort]
+        order = reversed(positions) if descending else positions
+        if matches is not None and len(matches) * 8 < len(positions):
+            # Small result: sorting it directly beats scanning the whole order
+            key = {pos: value for value, pos in zip(values, positions) if pos in matches}
+            order = sorted(key, key=lambda pos: (key[pos], pos), reverse=descending)
+            matches = None
+        ordered = [pos for pos in order if matches is None or pos in matches]
+        return len(ordered), [self.cars[pos] for pos in ordered[offset:offset + limit]]
+
+
+_index = None
+_mtime = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def load(path):
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    cars = data.get("cars", []) if isinstance(data, dict) else data
+    return InventoryIndex([dict(car) for car in cars])
+
+
+def get_index():
+    """The current index, reloaded if the snapshot file changed."""
+    global _index, _mtime, _checked_at
+    if _index is not None and time.monotonic() - _checked_at < RELOAD_CHECK_SECONDS:
+        return _index
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < RELOAD_CHECK_SECONDS:
+            return _index
+        path = settings.INVENTORY_SNAPSHOT_PATH
+        mtime = os.path.getmtime(path)
+        if mtime != _mtime:
+            _index, _mtime = load(path), mtime
+            logger.info(f"Loaded inventory snapshot with {len(_index.cars)} cars from {path}")
+        _checked_at = time.monotonic()
+        return _index
+
+
+def _list(params, name):
+    raw = params.get(name, "")
+    return [value for value in raw.split(",") if value.strip()]
+
+
+def search(params):
+    """
+    Run a search from query parameters: comma-separated ``dealer_id``,
+    ``make``, ``model`` and ``body_type``; ``<field>_min``/``<field>_max``
+    for year, mileage and price; ``sort`` (``price``, ``-year``, ...);
+    ``limit`` and ``cursor``. Returns ``(total, cars, next_cursor)``.
+    """
+    criteria = {param: _list(params, param) for param in CATEGORICAL if _list(params, param)}
+    ranges = {}
+    for param in NUMERIC:
+        low = parse_int(params, f"{param}_min")
+        high = parse_int(params, f"{param}_max")
+        if low is not None or high is not None:
+            ranges[param] = (low, high)
+    sort = params.get("sort") or "price"
+    descending = sort.startswith("-")
+    sort = sort.lstrip("-")
+    if sort not in NUMERIC:
+        raise InvalidQuery(f"'sort' must be one of: {', '.join(NUMERIC)}")
+    # The cursor is an offset into this snapshot's ordered results
+    offset = parse_int(params, "cursor", default=0, minimum=0)
+    limit = min(parse_int(params, "limit", default=DEFAULT_PAGE_SIZE, minimum=1), MAX_PAGE_SIZE)
+    total, cars = get_index().search(criteria, ranges, sort, descending, offset, limit)
+    next_cursor = offset + limit if offset + limit < total else None
+    return total, cars, next_cursor
@@ -0,0 +1,130 @@
+# djangoapp/loader.py
+#
+# Bulk, idempotent loader for the CarMake/CarModel catalog. Records come
+# from JSON (a list, or {"cars": [...]} like database/data/car_records.json)
+# or CSV and are upserted with bulk_create(update_conflicts=True) in batches
+# inside a single transaction, so re-running a load never duplicates rows.
+# Run it at deploy time through ``manage.py load_catalog``.
+
+import csv
+import json
+import logging
+from pathlib import Path
+
+from django.db import transaction
+
+from . import catalog
+from .models import CURRENT_YEAR, CarMake, CarModel
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+BATCH_SIZE = 1000
+MIN_YEAR = 1980
+
+# Inventory body types -> CarModel.CAR_TYPES keys
+BODY_TYPES = {
+    "sedan": "SEDAN",
+    "hatchback": "SEDAN",
+    "coupe": "SEDAN",
+    "convertible": "SEDAN",
+    "suv": "SUV",
+    "pickup": "SUV",
+    "wagon": "WAGON",
+    "minivan": "WAGON",
+}
+
+
+def read_records(path):
+    """Yield raw record dicts from a .json or .csv file."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as handle:
+            yield from csv.DictReader(handle)
+        return
+    with path.open(encoding="utf-8") as handle:
+        data = json.load(handle)
+    yield from data.get("cars", []) if isinstance(data, dict) else data
+
+
+def normalize(record):
+    """
+    Map a raw record (inventory or CarModel field names) to
+    ``(make, description, name, type, year, dealer_id)``; None when invalid.
+    """
+    make = str(record.get("make") or record.get("car_make") or record.get("CarMake") or "").strip()
+    name = str(record.get("model") or record.get("name") or record.get("CarModel") or "").strip()
+    body = str(record.get("bodyType") or record.get("type") or "").strip().lower()
+    car_type = BODY_TYPES.get(body)
+    try:
+        year = int(record.get("year"))
+        dealer_id = int(record.get("dealer_id") or 0)
+    except (TypeError, ValueError):
+        return None
+    if not make or not name or car_type is None or not MIN_YEAR <= year <= CURRENT_YEAR:
+        return None
+    return make, str(record.get("description") or ""), name, car_type, year, dealer_id
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def load_records(records, batch_size=BATCH_SIZE):
+    """
+    Upsert ``records`` into CarMake/CarModel. Makes are matched
+    case-insensitively against existing rows; a model is identified by
+    (make, name, year) and its type and dealer_id are updated in place.
+    Returns ``{"makes", "models", "skipped"}``.
+    """
+    makes, models, skipped = {}, {}, 0
+    for record in records:
+        row = normalize(record)
+        if row is None:
+            skipped += 1
+            continue
+        make, description, name, car_type, year, dealer_id = row
+        if description or make.lower() not in makes:
+            makes[make.lower()] = (make, description)
+        models[(make.lower(), name, year)] = (car_type, dealer_id)
+
+    with transaction.atomic():
+        existing = {name.lower(): name for name in CarMake.objects.values_list("name", flat=True)}
+        described = [CarMake(name=existing.get(key, make), description=description)
+                     for key, (make, description) in makes.items() if description]
+        undescribed = [CarMake(name=existing.get(key, make))
+                       for key, (make, description) in makes.items() if not description]
+        for batch in _batches(described, batch_size):
+            CarMake.objects.bulk_create(
+                batch, update_conflicts=True, unique_fields=["name"],
+                update_fields=["description", "updated_at"])
+        for batch in _batches(undescribed, batch_size):
+            CarMake.objects.bulk_create(batch, ignore_conflicts=True)
+        make_ids = {name.lower(): pk for pk, name in CarMake.objects.values_list("id", "name")}
+
+        car_models = [
+            CarModel(car_make_id=make_ids[make], name=name, year=year, type=car_type,
+                     dealer_id=dealer_id)
+            for (make, name, year), (car_type, dealer_id) in models.items()
+        ]
+        for batch in _batches(car_models, batch_size):
+            CarModel.objects.bulk_create(
+                batch, update_conflicts=True, unique_fields=["car_make", "name", "year"],
+                update_fields=["type", "dealer_id", "updated_at"])
+        # bulk_create sends no post_save signals, so refresh the snapshot here
+        catalog.schedule_rebuild()
+
+    logger.info(f"Loaded {len(makes)} makes and {len(car_models)} models "
+                f"({skipped} records skipped).")
+    return {"makes": len(makes), "models": len(car_models), "skipped": skipped}
+
+
+def load_file(path, batch_size=BATCH_SIZE):
+    return load_records(read_records(path), batch_size=batch_size)
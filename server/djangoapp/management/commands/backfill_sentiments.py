@@ -0,0 +1,22 @@
+# djangoapp/management/commands/backfill_sentiments.py
+from django.core.management.base import BaseCommand, CommandError
+from djangoapp.restapis import backfill_sentiments
+
+
+class Command(BaseCommand):
+    help = "Score reviews that have no stored sentiment and save the labels in the review store."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=200,
+            help="Reviews scored and written back per batch.")
+
+    def handle(self, *args, **options):
+        summary = backfill_sentiments(batch_size=options['batch_size'])
+        if summary is None:
+            raise CommandError("Could not fetch reviews from the backend.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {summary['updated']} of {summary['missing']} unscored reviews "
+            f"({summary['reviews']} total, {summary['failed_batches']} failed batches)."))
+        if summary['failed_batches']:
+            raise CommandError("Some batches failed; re-run to retry them.")
@@ -0,0 +1,34 @@
+# djangoapp/management/commands/deliver_reviews.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from djangoapp import outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver reviews waiting in the outbox to the dealer/review API."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=outbox.DEFAULT_BATCH_SIZE,
+            help="Reviews claimed and posted per batch.")
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Deliver what is due now and exit instead of polling.")
+        parser.add_argument(
+            '--interval', type=float, default=settings.REVIEW_OUTBOX_POLL_SECONDS,
+            help="Seconds between polls when running as a daemon.")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            summary = outbox.drain(options['batch_size'])
+            if summary['claimed'] or options['once']:
+                self.stdout.write(
+                    f"Delivered {summary['delivered']} reviews "
+                    f"({summary['retrying']} to retry, {summary['failed']} failed).")
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,19 @@
+# djangoapp/management/commands/invalidate_dealer_cache.py
+from django.core.management.base import BaseCommand, CommandError
+from djangoapp import dealer_cache
+
+
+class Command(BaseCommand):
+    help = "Invalidate cached dealer list/detail responses (all of them by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--state', help="Only drop the list for this state.")
+        parser.add_argument('--dealer', type=int, help="Only drop this dealer's entries.")
+
+    def handle(self, *args, **options):
+        if dealer_cache.is_process_local():
+            raise CommandError(
+                "The 'dealers' cache is per-process memory, so this command cannot reach the "
+                "web workers. Set DEALER_CACHE_BACKEND to file, sqlite or redis.")
+        dealer_cache.invalidate(state=options['state'], dealer_id=options['dealer'])
+        self.stdout.write(self.style.SUCCESS("Dealer cache invalidated."))
@@ -0,0 +1,37 @@
+# djangoapp/management/commands/load_catalog.py
+from django.core.management.base import BaseCommand, CommandError
+from djangoapp.loader import BATCH_SIZE, load_file, load_records
+from djangoapp.populate import SEED_RECORDS
+
+
+class Command(BaseCommand):
+    help = "Bulk upsert car makes and models from JSON/CSV files (idempotent)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*',
+            help="JSON or CSV files, e.g. database/data/car_records.json.")
+        parser.add_argument(
+            '--seed', action='store_true',
+            help="Also load the built-in seed makes and models.")
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help="Rows per bulk insert statement.")
+
+    def handle(self, *args, **options):
+        if not options['paths'] and not options['seed']:
+            raise CommandError("Give at least one file or --seed.")
+        batch_size = options['batch_size']
+        sources = []
+        if options['seed']:
+            sources.append(("seed data", lambda: load_records(SEED_RECORDS, batch_size)))
+        sources += [(path, lambda path=path: load_file(path, batch_size))
+                    for path in options['paths']]
+        for label, load in sources:
+            try:
+                summary = load()
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not load {label}: {exc}")
+            self.stdout.write(self.style.SUCCESS(
+                f"Loaded {label}: {summary['makes']} makes, {summary['models']} models, "
+                f"{summary['skipped']} skipped."))
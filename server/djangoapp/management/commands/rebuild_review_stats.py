@@ -0,0 +1,15 @@
+# djangoapp/management/commands/rebuild_review_stats.py
+from django.core.management.base import BaseCommand, CommandError
+from djangoapp import review_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-dealer review aggregates from the review store."
+
+    def handle(self, *args, **options):
+        summary = review_stats.rebuild()
+        if summary is None:
+            raise CommandError("Could not fetch reviews from the backend.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt stats for {summary['dealers']} dealers from {summary['reviews']} reviews "
+            f"({summary['scored']} scored)."))
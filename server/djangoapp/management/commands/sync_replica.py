@@ -0,0 +1,46 @@
+# djangoapp/management/commands/sync_replica.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from djangoapp import replica
+
+
+class Command(BaseCommand):
+    help = "Copy dealers and new reviews from the dealer/review API into the local replica tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=replica.DEFAULT_BATCH_SIZE,
+            help="Reviews pulled per request.")
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Re-pull every review instead of only those past the sync cursor.")
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Keep running, syncing every INTERVAL seconds.")
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            summary = replica.sync(batch_size=options['batch_size'], full=full)
+            self.report(summary, options['interval'])
+            if not options['interval']:
+                break
+            full = False
+            time.sleep(options['interval'])
+
+    def report(self, summary, keep_running):
+        dealers, reviews = summary['dealers'], summary['reviews']
+        if dealers is not None:
+            self.stdout.write(f"Synced {dealers} dealers.")
+        if reviews is not None:
+            self.stdout.write(
+                f"Pulled {reviews['pulled']} reviews after id {reviews['since_id']} "
+                f"({reviews['scored']} scored).")
+        if dealers is None or reviews is None:
+            message = "Could not fetch dealers or reviews from the backend."
+            if not keep_running:
+                raise CommandError(message)
+            self.stderr.write(message)
+        else:
+            self.stdout.write(self.style.SUCCESS("Replica is up to date."))
@@ -0,0 +1,20 @@
+# djangoapp/management/commands/warm_sentiment_cache.py
+from django.core.management.base import BaseCommand, CommandError
+from djangoapp.restapis import sentiment_cache, warm_sentiment_cache
+
+
+class Command(BaseCommand):
+    help = "Pre-score every review from /fetchReviews into the sentiment cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=200,
+            help="Number of review texts sent per sentiment batch call.")
+
+    def handle(self, *args, **options):
+        summary = warm_sentiment_cache(batch_size=options['batch_size'])
+        if summary is None:
+            raise CommandError("Could not fetch reviews from the backend.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed sentiment cache: {summary['reviews']} reviews, "
+            f"{summary['cache_misses']} scored. Stats: {sentiment_cache.stats()}"))
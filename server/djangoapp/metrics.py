@@ -0,0 +1,133 @@
+# djangoapp/metrics.py
+#
+# Per-request timing of outbound upstream calls and DB queries, plus
+# process-wide histograms rendered in the Prometheus text format at /metrics.
+# Histograms are per process: with several gunicorn workers each worker
+# reports its own series, so scrape every worker or aggregate downstream.
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_current = contextvars.ContextVar("djangoapp_request_timings", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, help_text, label_names, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = sorted(self._series.items())
+        for labels, (counts, total, count) in series_items:
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "djangoapp_request_duration_seconds", "Django request handling time.",
+    ("route", "method", "status"))
+UPSTREAM_DURATION = Histogram(
+    "djangoapp_upstream_request_duration_seconds", "Outbound upstream call time.",
+    ("upstream", "template", "status"))
+UPSTREAM_BYTES = Histogram(
+    "djangoapp_upstream_response_bytes", "Outbound upstream response size.",
+    ("upstream", "template"), buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576))
+DB_QUERIES = Histogram(
+    "djangoapp_db_queries_per_request", "Database queries per request.",
+    ("route",), buckets=COUNT_BUCKETS)
+DB_DURATION = Histogram(
+    "djangoapp_db_time_per_request_seconds", "Database time per request.", ("route",))
+
+HISTOGRAMS = [REQUEST_DURATION, UPSTREAM_DURATION, UPSTREAM_BYTES, DB_QUERIES, DB_DURATION]
+
+
+class RequestTimings:
+    """Everything measured while handling one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.upstream_calls = []
+        self.db_queries = 0
+        self.db_time = 0.0
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def begin_request():
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record_upstream(upstream, method, template, status, nbytes, duration):
+    """Called by restapis for every outbound call; status is 0 on network errors."""
+    UPSTREAM_DURATION.observe(duration, upstream, template, str(status))
+    UPSTREAM_BYTES.observe(nbytes, upstream, template)
+    timings = _current.get()
+    if timings is not None:
+        timings.upstream_calls.append({
+            "upstream": upstream,
+            "method": method,
+            "template": template,
+            "status": status,
+            "bytes": nbytes,
+            "duration_ms": round(duration * 1000, 2),
+        })
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """Database execute wrapper (installed on every connection) counting queries."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_queries += 1
+        timings.db_time += time.perf_counter() - started
+
+
+def render(extra_lines=()):
+    return "\n".join([histogram.render() for histogram in HISTOGRAMS] + list(extra_lines)) + "\n"
@@ -1,9 +1,22 @@
-from flask import Flask
-from nltk.sentiment import SentimentIntensityAnalyzer
+from flask import Flask, jsonify, request
+from sentiment_engine import classify, get_engine
 import json
+import logging
+import os
+
+logger = logging.getLogger("sentiment")
+logger.setLevel(os.getenv("SENTIMENT_LOG_LEVEL", "info").upper())
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
 app = Flask("Sentiment Analyzer")
 
-sia = SentimentIntensityAnalyzer()
+# Loaded at import, i.e. once in the gunicorn master with preload_app
+engine = get_engine()
 
 
 @app.get('/')
@@ -12,24 +25,32 @@ def home():
     Use /analyze/text to get the sentiment"
 
 
+@app.get('/health')
+def health():
+    return jsonify({"status": "ok", "lexicon_entries": len(engine.analyzer.lexicon)})
+
+
 @app.get('/analyze/<input_txt>')
 def analyze_sentiment(input_txt):
 
-    scores = sia.polarity_scores(input_txt)
-    print(scores)
-    pos = float(scores['pos'])
-    neg = float(scores['neg'])
-    neu = float(scores['neu'])
-    res = "positive"
-    print("pos neg nue ", pos, neg, neu)
-    if (neg > pos and neg > neu):
-        res = "negative"
-    elif (neu > neg and neu > pos):
-        res = "neutral"
-    res = json.dumps({"sentiment": res})
-    print(res)
-    return res
+    scores = engine.polarity_scores(input_txt)
+    res = classify(scores)
+    logger.debug(json.dumps({"event": "analyze", "sentiment": res, "scores": scores}))
+    return json.dumps({"sentiment": res})
+
+
+@app.post('/analyze_batch')
+def analyze_sentiment_batch():
+    # Body: {"texts": ["...", ...]} -> {"sentiments": ["positive", ...]}
+    payload = request.get_json(silent=True) or {}
+    texts = payload.get("texts")
+    if not isinstance(texts, list):
+        return jsonify({"error": "Expected a JSON body with a 'texts' list"}), 400
+    sentiments = engine.label_many(texts)
+    logger.debug(json.dumps({"event": "analyze_batch", "texts": len(texts)}))
+    return jsonify({"sentiments": sentiments})
 
 
 if __name__ == "__main__":
+    # Development server only; use gunicorn.conf.py in production
     app.run(debug=True)
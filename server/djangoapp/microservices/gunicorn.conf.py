@@ -0,0 +1,26 @@
+# gunicorn.conf.py
+#
+# Production serving for the sentiment service:
+#   gunicorn --config gunicorn.conf.py app:app
+#
+# preload_app imports app.py (and loads the VADER lexicon) once in the
+# master; workers are forked afterwards and share those pages copy-on-write.
+# Scale with SENTIMENT_WORKERS (processes) and SENTIMENT_THREADS (threads
+# per worker).
+
+import multiprocessing
+import os
+
+bind = os.getenv("SENTIMENT_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("SENTIMENT_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("SENTIMENT_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = True
+timeout = int(os.getenv("SENTIMENT_TIMEOUT", "30"))
+keepalive = 5
+max_requests = int(os.getenv("SENTIMENT_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+loglevel = os.getenv("SENTIMENT_LOG_LEVEL", "info")
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,77 @@
+# sentiment_engine.py
+#
+# VADER sentiment scoring shared by the Flask service (app.py) and, with
+# SENTIMENT_BACKEND=embedded, by the Django app in-process. The lexicon in
+# sentiment/vader_lexicon.zip is parsed once per process into VADER's
+# word -> valence dict; labels follow the same pos/neg/neu rule as the
+# HTTP service because both use classify() from this module.
+#
+# Scope: scoring is NLTK's SentimentIntensityAnalyzer unchanged, and its
+# lexicon dict is the lookup structure, which keeps labels identical to the
+# service. Batches are not tokenized jointly. label_many() tokenizes and
+# scores each distinct text of a batch once, and an LRU of labels skips
+# texts already seen by the process; there is no custom lexicon structure
+# or batch tokenizer.
+
+import os
+import threading
+from functools import lru_cache
+
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# nltk resolves "sentiment/vader_lexicon.zip/..." against nltk.data.path
+if HERE not in nltk.data.path:
+    nltk.data.path.insert(0, HERE)
+
+LABEL_CACHE_SIZE = int(os.getenv("SENTIMENT_LABEL_CACHE_SIZE", "4096"))
+
+
+def classify(scores):
+    pos = float(scores['pos'])
+    neg = float(scores['neg'])
+    neu = float(scores['neu'])
+    res = "positive"
+    if (neg > pos and neg > neu):
+        res = "negative"
+    elif (neu > neg and neu > pos):
+        res = "neutral"
+    return res
+
+
+class SentimentEngine:
+    """Loads the VADER lexicon once and labels single texts or batches."""
+
+    def __init__(self):
+        self.analyzer = SentimentIntensityAnalyzer()
+        # Identical texts (common across a dealer's reviews and across
+        # requests) are scored once
+        self.label = lru_cache(maxsize=LABEL_CACHE_SIZE)(self._label)
+
+    def polarity_scores(self, text):
+        return self.analyzer.polarity_scores(text)
+
+    def _label(self, text):
+        return classify(self.analyzer.polarity_scores(text))
+
+    def label_many(self, texts):
+        """Labels for ``texts`` in order; each distinct text is tokenized and scored once."""
+        texts = [str(text) for text in texts]
+        labels = {text: self.label(text) for text in dict.fromkeys(texts)}
+        return [labels[text] for text in texts]
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """The process-wide engine, built on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SentimentEngine()
+    return _engine
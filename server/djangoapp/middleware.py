@@ -0,0 +1,84 @@
+# djangoapp/middleware.py
+
+import json
+import logging
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import metrics
+
+logger = logging.getLogger("djangoapp.timing")
+logger.setLevel(logging.INFO)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+
+class UpstreamTimingMiddleware:
+    """
+    Times each request together with the upstream calls and DB queries it
+    made. The breakdown is returned as a ``Server-Timing`` header, logged as
+    one JSON line on the ``djangoapp.timing`` logger and aggregated into the
+    histograms served at ``/metrics``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings, token = metrics.begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.finish(request, response, timings)
+        return response
+
+    async def __acall__(self, request):
+        timings, token = metrics.begin_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.finish(request, response, timings)
+        return response
+
+    def finish(self, request, response, timings):
+        total = timings.elapsed()
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "<unresolved>"
+        metrics.REQUEST_DURATION.observe(total, route, request.method, str(response.status_code))
+        metrics.DB_QUERIES.observe(timings.db_queries, route)
+        metrics.DB_DURATION.observe(timings.db_time, route)
+
+        per_upstream = defaultdict(lambda: [0, 0.0])
+        for call in timings.upstream_calls:
+            per_upstream[call["upstream"]][0] += 1
+            per_upstream[call["upstream"]][1] += call["duration_ms"]
+        entries = [f"total;dur={total * 1000:.1f}",
+                   f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_queries} queries"']
+        for upstream, (count, duration_ms) in sorted(per_upstream.items()):
+            entries.append(f'{upstream};dur={duration_ms:.1f};desc="{count} calls"')
+        response["Server-Timing"] = ", ".join(entries)
+
+        logger.info(json.dumps({
+            "event": "request_timing",
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 2),
+            "db_queries": timings.db_queries,
+            "db_time_ms": round(timings.db_time * 1000, 2),
+            "upstream_calls": timings.upstream_calls,
+        }))
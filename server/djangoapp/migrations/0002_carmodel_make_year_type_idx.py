@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(
+                fields=['car_make', 'year', 'type'],
+                name='carmodel_make_year_type_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0002_carmodel_make_year_type_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='carmodel',
+            constraint=models.UniqueConstraint(
+                fields=['car_make', 'name', 'year'],
+                name='carmodel_make_name_year_uniq'),
+        ),
+    ]
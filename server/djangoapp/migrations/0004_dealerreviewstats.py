@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0003_carmodel_make_name_year_uniq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DealerReviewStats',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dealer_id', models.PositiveIntegerField(
+                    help_text='ID of the dealer in the external database.', unique=True)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('positive_count', models.PositiveIntegerField(default=0)),
+                ('neutral_count', models.PositiveIntegerField(default=0)),
+                ('negative_count', models.PositiveIntegerField(default=0)),
+                ('last_review_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_review_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(
+                    auto_now=True, help_text='Date when the aggregate was last updated.')),
+            ],
+        ),
+    ]
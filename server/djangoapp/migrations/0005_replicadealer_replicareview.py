@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0004_dealerreviewstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicaDealer',
+            fields=[
+                ('id', models.PositiveIntegerField(
+                    help_text='ID of the dealer in the external database.',
+                    primary_key=True, serialize=False)),
+                ('full_name', models.CharField(max_length=200)),
+                ('short_name', models.CharField(blank=True, max_length=100)),
+                ('city', models.CharField(max_length=100)),
+                ('state', models.CharField(max_length=100)),
+                ('st', models.CharField(blank=True, max_length=10)),
+                ('address', models.CharField(max_length=200)),
+                ('zip', models.CharField(max_length=20)),
+                ('lat', models.CharField(max_length=30)),
+                ('long', models.CharField(max_length=30)),
+                ('synced_at', models.DateTimeField(
+                    auto_now=True, help_text='Date when the row was last written by a sync.')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['state'], name='replicadealer_state_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReplicaReview',
+            fields=[
+                ('id', models.PositiveIntegerField(
+                    help_text='ID of the review in the external database.',
+                    primary_key=True, serialize=False)),
+                ('dealership', models.PositiveIntegerField()),
+                ('name', models.CharField(max_length=200)),
+                ('review', models.TextField()),
+                ('purchase', models.BooleanField(default=False)),
+                ('purchase_date', models.CharField(blank=True, max_length=30)),
+                ('car_make', models.CharField(blank=True, max_length=100)),
+                ('car_model', models.CharField(blank=True, max_length=100)),
+                ('car_year', models.PositiveIntegerField(blank=True, null=True)),
+                ('sentiment', models.CharField(blank=True, max_length=10)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['dealership', 'id'], name='replicareview_dealer_id_idx'),
+                ],
+            },
+        ),
+    ]
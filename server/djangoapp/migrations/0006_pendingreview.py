@@ -0,0 +1,39 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0005_replicadealer_replicareview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingReview',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=64, unique=True)),
+                ('username', models.CharField(db_index=True, max_length=150)),
+                ('dealer_id', models.PositiveIntegerField()),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(
+                    choices=[('pending', 'Pending'), ('delivering', 'Delivering'),
+                             ('delivered', 'Delivered'), ('failed', 'Failed')],
+                    default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('review_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['status', 'next_attempt_at'],
+                                 name='pendingreview_due_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+def create_state_row(apps, schema_editor):
+    # Starts at 0 rather than the highest local review id: that mark also
+    # counted reviews added by add_review, so the next sync re-pulls once
+    ReplicaSyncState = apps.get_model('djangoapp', 'ReplicaSyncState')
+    ReplicaSyncState.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0007_catalogversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicaSyncState',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_cursor', models.PositiveBigIntegerField(default=0)),
+                ('synced_at', models.DateTimeField(
+                    auto_now=True, help_text='Date when the cursor last moved.')),
+            ],
+        ),
+        migrations.RunPython(create_state_row, migrations.RunPython.noop),
+    ]
@@ -92,6 +92,269 @@ class CarModel(models.Model):
         help_text="Date when the car model was last updated."
     )
 
+    class Meta:
+        constraints = [
+            # Natural key used by the bulk catalog loader's upserts
+            models.UniqueConstraint(fields=['car_make', 'name', 'year'],
+                                    name='carmodel_make_name_year_uniq'),
+        ]
+        indexes = [
+            # Serves the make/year/type filters on get_cars
+            models.Index(fields=['car_make', 'year', 'type'], name='carmodel_make_year_type_idx'),
+        ]
+
     def __str__(self):
         # Display car make, model name, and year for clarity
         return f"{self.car_make.name} {self.name} ({self.year})"
+
+
+class CatalogVersion(models.Model):
+    """
+    Single row counting changes to the CarMake/CarModel catalog. It is
+    bumped in the same transaction as each change, and the get_cars
+    snapshot is keyed by it, so every worker notices edits made elsewhere.
+    Attributes:
+        version (int): Incremented on every catalog change.
+        updated_at (datetime): Date when the catalog last changed.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Date when the catalog last changed."
+    )
+
+    def __str__(self):
+        return f"Catalog version {self.version}"
+
+
+class DealerReviewStats(models.Model):
+    """
+    Materialized review aggregates for one dealer, kept current by
+    add_review and rebuilt from the review store by
+    ``manage.py rebuild_review_stats``.
+    Attributes:
+        dealer_id (int): ID of the dealer in the external database.
+        review_count (int): Number of reviews.
+        positive_count / neutral_count / negative_count (int): Sentiment breakdown.
+        last_review_id (int): Highest review id seen for the dealer.
+        last_review_at (datetime): When the latest review was posted through
+            this app (unknown for reviews only seen by a rebuild).
+        updated_at (datetime): Date when the aggregate was last updated.
+    """
+    dealer_id = models.PositiveIntegerField(
+        unique=True,
+        help_text="ID of the dealer in the external database."
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    positive_count = models.PositiveIntegerField(default=0)
+    neutral_count = models.PositiveIntegerField(default=0)
+    negative_count = models.PositiveIntegerField(default=0)
+    last_review_id = models.PositiveIntegerField(null=True, blank=True)
+    last_review_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Date when the aggregate was last updated."
+    )
+
+    def as_dict(self):
+        return {
+            "review_count": self.review_count,
+            "positive": self.positive_count,
+            "neutral": self.neutral_count,
+            "negative": self.negative_count,
+            "last_review_id": self.last_review_id,
+            "last_review_at": self.last_review_at.isoformat() if self.last_review_at else None,
+        }
+
+    def __str__(self):
+        return f"Dealer {self.dealer_id}: {self.review_count} reviews"
+
+
+class ReplicaDealer(models.Model):
+    """
+    Local copy of a dealership from the dealer/review API, written by
+    ``manage.py sync_replica`` and read instead of the API when
+    settings.REPLICA_MODE is on.
+    Attributes:
+        id (int): Dealer ID in the external database.
+        full_name, short_name, city, state, st, address, zip (str): As upstream.
+        lat, long (str): Coordinates as sent by upstream.
+        synced_at (datetime): Date when the row was last written by a sync.
+    """
+    id = models.PositiveIntegerField(
+        primary_key=True,
+        help_text="ID of the dealer in the external database."
+    )
+    full_name = models.CharField(max_length=200)
+    short_name = models.CharField(max_length=100, blank=True)
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=100)
+    st = models.CharField(max_length=10, blank=True)
+    address = models.CharField(max_length=200)
+    zip = models.CharField(max_length=20)
+    lat = models.CharField(max_length=30)
+    long = models.CharField(max_length=30)
+    synced_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Date when the row was last written by a sync."
+    )
+
+    class Meta:
+        indexes = [
+            # Serves /fetchDealers/<state> reads
+            models.Index(fields=['state'], name='replicadealer_state_idx'),
+        ]
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "full_name": self.full_name,
+            "short_name": self.short_name,
+            "city": self.city,
+            "state": self.state,
+            "st": self.st,
+            "address": self.address,
+            "zip": self.zip,
+            "lat": self.lat,
+            "long": self.long,
+        }
+
+    def __str__(self):
+        return f"{self.full_name} ({self.id})"
+
+
+class ReplicaReview(models.Model):
+    """
+    Local copy of a dealer review from the dealer/review API. Pulled
+    incrementally by ``manage.py sync_replica`` (by review id) and added
+    by add_review as reviews are posted.
+    Attributes:
+        id (int): Review ID in the external database.
+        dealership (int): ID of the reviewed dealer.
+        name, review, purchase_date, car_make, car_model (str): As upstream.
+        purchase (bool): Whether the reviewer bought a car.
+        car_year (int): Year of the purchased car, if any.
+        sentiment (str): Stored sentiment label, blank if not yet scored.
+    """
+    id = models.PositiveIntegerField(
+        primary_key=True,
+        help_text="ID of the review in the external database."
+    )
+    dealership = models.PositiveIntegerField()
+    name = models.CharField(max_length=200)
+    review = models.TextField()
+    purchase = models.BooleanField(default=False)
+    purchase_date = models.CharField(max_length=30, blank=True)
+    car_make = models.CharField(max_length=100, blank=True)
+    car_model = models.CharField(max_length=100, blank=True)
+    car_year = models.PositiveIntegerField(null=True, blank=True)
+    sentiment = models.CharField(max_length=10, blank=True)
+
+    class Meta:
+        indexes = [
+            # Serves /fetchReviews/dealer/<id> reads in id order
+            models.Index(fields=['dealership', 'id'], name='replicareview_dealer_id_idx'),
+        ]
+
+    def as_dict(self):
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "dealership": self.dealership,
+            "review": self.review,
+            "purchase": self.purchase,
+            "purchase_date": self.purchase_date,
+            "car_make": self.car_make,
+            "car_model": self.car_model,
+            "car_year": self.car_year,
+        }
+        if self.sentiment:
+            data["sentiment"] = self.sentiment
+        return data
+
+    def __str__(self):
+        return f"Review {self.id} for dealer {self.dealership}"
+
+
+class ReplicaSyncState(models.Model):
+    """
+    Single row holding where ``manage.py sync_replica`` resumes its
+    incremental review pull. Only the sync advances it; reviews added by
+    add_review do not, so a review missed locally is still pulled later.
+    Attributes:
+        review_cursor (int): Highest upstream review id the sync has copied.
+        synced_at (datetime): Date when the cursor last moved.
+    """
+    review_cursor = models.PositiveBigIntegerField(default=0)
+    synced_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Date when the cursor last moved."
+    )
+
+    def __str__(self):
+        return f"Replica synced past review {self.review_cursor}"
+
+
+class PendingReview(models.Model):
+    """
+    A submitted review waiting in the local outbox for delivery to the
+    dealer/review API (settings.REVIEW_OUTBOX). Written by add_review and
+    delivered by the outbox worker (``manage.py deliver_reviews`` or the
+    in-process thread).
+    Attributes:
+        idempotency_key (str): Unique key sent with the review, so a retried
+            delivery never inserts it twice.
+        username (str): User who submitted the review.
+        dealer_id (int): ID of the reviewed dealer.
+        payload (dict): The validated review fields.
+        status (str): pending, delivering, delivered or failed.
+        attempts (int): Delivery attempts so far.
+        next_attempt_at (datetime): Earliest time of the next attempt; for
+            ``delivering`` rows, when the worker's claim expires.
+        last_error (str): Error from the latest failed attempt.
+        review_id (int): ID assigned upstream once delivered.
+        created_at / delivered_at (datetime): Submission and delivery times.
+    """
+    PENDING = 'pending'
+    DELIVERING = 'delivering'
+    DELIVERED = 'delivered'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'Pending'),
+        (DELIVERING, 'Delivering'),
+        (DELIVERED, 'Delivered'),
+        (FAILED, 'Failed'),
+    ]
+
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    username = models.CharField(max_length=150, db_index=True)
+    dealer_id = models.PositiveIntegerField()
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    review_id = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Serves the worker's "due for delivery" scan
+            models.Index(fields=['status', 'next_attempt_at'], name='pendingreview_due_idx'),
+        ]
+
+    def as_dict(self):
+        return {
+            "idempotency_key": self.idempotency_key,
+            "dealer_id": self.dealer_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "last_error": self.last_error or None,
+            "review_id": self.review_id,
+            "created_at": self.created_at.isoformat(),
+            "delivered_at": self.delivered_at.isoformat() if self.delivered_at else None,
+        }
+
+    def __str__(self):
+        return f"Review for dealer {self.dealer_id} by {self.username} ({self.status})"
@@ -0,0 +1,234 @@
+# djangoapp/outbox.py
+#
+# Write-behind review submission (settings.REVIEW_OUTBOX). add_review
+# validates a review, stores it as a PendingReview and answers 202; a worker
+# (the in-process thread below, or manage.py deliver_reviews) delivers due
+# entries to the dealer/review API in batches, retrying with exponential
+# backoff. Every entry carries an idempotency key that the Node service
+# uses to ignore repeated deliveries of the same review.
+
+import logging
+import random
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import PendingReview
+from .restapis import REVIEW_REQUIRED_FIELDS, missing_review_fields, post_reviews
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+DEFAULT_BATCH_SIZE = 20
+CLAIM_SECONDS = 60  # A worker that dies mid-delivery releases its entries after this
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_CAP_SECONDS = 300.0
+MAX_KEY_LENGTH = 64
+WORKER_DISPATCH_UID = "djangoapp_outbox_worker"
+
+
+class InvalidReview(ValueError):
+    """The submitted review cannot be queued (missing fields, bad key)."""
+
+
+def enabled():
+    return getattr(settings, "REVIEW_OUTBOX", False)
+
+
+def enqueue(data, username, idempotency_key=None):
+    """
+    Validate ``data`` and store it for delivery. Returns ``(entry,
+    created)``; resubmitting with the same ``idempotency_key`` returns the
+    existing entry. Raises InvalidReview.
+    """
+    if not isinstance(data, dict):
+        raise InvalidReview("Expected a JSON object")
+    missing = missing_review_fields(data)
+    if missing:
+        raise InvalidReview(f"Missing required fields: {', '.join(missing)}")
+    try:
+        dealer_id = int(data["dealership"])
+    except (TypeError, ValueError):
+        raise InvalidReview("'dealership' must be a dealer id")
+    key = idempotency_key or uuid.uuid4().hex
+    if len(key) > MAX_KEY_LENGTH:
+        raise InvalidReview(f"Idempotency key longer than {MAX_KEY_LENGTH} characters")
+    entry, created = PendingReview.objects.get_or_create(
+        idempotency_key=key,
+        defaults={
+            "username": username,
+            "dealer_id": dealer_id,
+            "payload": {field: data[field] for field in REVIEW_REQUIRED_FIELDS},
+        },
+    )
+    if entry.username != username:
+        raise InvalidReview("Idempotency key already used")
+    if created:
+        _notify_worker()
+    return entry, created
+
+
+def pending_for(username, status=None, limit=50):
+    entries = PendingReview.objects.filter(username=username).order_by("-id")
+    if status:
+        entries = entries.filter(status=status)
+    return [entry.as_dict() for entry in entries[:limit]]
+
+
+def submission_for(username, idempotency_key):
+    entry = PendingReview.objects.filter(username=username, idempotency_key=idempotency_key).first()
+    return entry.as_dict() if entry is not None else None
+
+
+def claim(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Claim up to ``batch_size`` due entries for this worker. Entries stay
+    claimed (``delivering``) for CLAIM_SECONDS, so concurrent workers never
+    deliver the same entry at the same time.
+    """
+    now = timezone.now()
+    due = Q(status=PendingReview.PENDING) | Q(status=PendingReview.DELIVERING)
+    candidates = list(PendingReview.objects.filter(due, next_attempt_at__lte=now)
+                      .order_by("next_attempt_at", "id").values_list("id", flat=True)[:batch_size])
+    lease = now + timedelta(seconds=CLAIM_SECONDS)
+    claimed = [entry_id for entry_id in candidates
+               if PendingReview.objects.filter(due, id=entry_id, next_attempt_at__lte=now)
+               .update(status=PendingReview.DELIVERING, next_attempt_at=lease)]
+    return list(PendingReview.objects.filter(id__in=claimed).order_by("id"))
+
+
+def retry_delay(attempts):
+    delay = min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _delivered(entry, review):
+    entry.status = PendingReview.DELIVERED
+    entry.review_id = review.get("id")
+    entry.delivered_at = timezone.now()
+    entry.last_error = ""
+    entry.save(update_fields=["status", "review_id", "delivered_at", "last_error", "attempts"])
+    # Imported lazily: views imports this module
+    from .views import record_replica_review, record_review_stats
+    record_review_stats(review)
+    record_replica_review(review)
+
+
+def _failed(entry, error):
+    entry.last_error = str(error)[:1000]
+    if entry.attempts >= settings.REVIEW_OUTBOX_MAX_ATTEMPTS:
+        entry.status = PendingReview.FAILED
+        logger.error(f"Giving up on review {entry.idempotency_key} "
+                     f"after {entry.attempts} attempts: {error}")
+    else:
+        entry.status = PendingReview.PENDING
+        entry.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(entry.attempts))
+    entry.save(update_fields=["status", "next_attempt_at", "last_error", "attempts"])
+
+
+def deliver_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Deliver one batch of due entries in a single /insert_reviews call.
+    Returns ``{"claimed", "delivered", "retrying", "failed"}``.
+    """
+    entries = claim(batch_size)
+    summary = {"claimed": len(entries), "delivered": 0, "retrying": 0, "failed": 0}
+    if not entries:
+        return summary
+    results = post_reviews([dict(entry.payload, idempotency_key=entry.idempotency_key)
+                            for entry in entries])
+    for entry, result in zip(entries, results):
+        entry.attempts += 1
+        if result and "id" in result:
+            _delivered(entry, result)
+            summary["delivered"] += 1
+            continue
+        _failed(entry, (result or {}).get("message", "Delivery failed"))
+        summary["failed" if entry.status == PendingReview.FAILED else "retrying"] += 1
+    logger.info(f"Outbox batch: {summary}")
+    return summary
+
+
+def drain(batch_size=DEFAULT_BATCH_SIZE):
+    """Deliver batches until nothing is due; returns the summed summary."""
+    total = {"claimed": 0, "delivered": 0, "retrying": 0, "failed": 0}
+    while True:
+        summary = deliver_batch(batch_size)
+        for name, count in summary.items():
+            total[name] += count
+        if summary["claimed"] < batch_size:
+            return total
+
+
+class OutboxWorker(threading.Thread):
+    """Daemon thread that drains the outbox when woken and every poll interval."""
+
+    def __init__(self, poll_seconds):
+        super().__init__(name="review-outbox", daemon=True)
+        self.poll_seconds = poll_seconds
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+
+    def run(self):
+        while True:
+            self.wake.wait(self.poll_seconds)
+            self.wake.clear()
+            if self.stopping.is_set():
+                return
+            close_old_connections()
+            try:
+                drain()
+            except Exception:
+                logger.exception("Review outbox delivery failed")
+
+    def stop(self):
+        self.stopping.set()
+        self.wake.set()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_worker():
+    """
+    Start this process's delivery thread if REVIEW_OUTBOX_THREAD is on and
+    return it (None otherwise).
+    """
+    global _worker
+    if not settings.REVIEW_OUTBOX_THREAD:
+        return None
+    with _worker_lock:
+        if _worker is None:
+            _worker = OutboxWorker(settings.REVIEW_OUTBOX_POLL_SECONDS)
+            _worker.start()
+    return _worker
+
+
+def start_on_first_request(sender, **kwargs):
+    """
+    request_started receiver (connected by AppConfig.ready()): starts the
+    worker in processes that serve requests, so entries left pending by a
+    restart are delivered without waiting for a new review. Management
+    commands (migrate, deliver_reviews, ...) never start it.
+    """
+    request_started.disconnect(start_on_first_request, dispatch_uid=WORKER_DISPATCH_UID)
+    start_worker()
+
+
+def _notify_worker():
+    worker = start_worker()
+    if worker is not None:
+        worker.wake.set()
@@ -0,0 +1,86 @@
+# djangoapp/pagination.py
+#
+# Query-string parsing shared by the paginated list endpoints. Pages are
+# keyset-paginated on ``id``: ``cursor`` is the last id of the previous page.
+
+import math
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+PAGE_PARAMS = {"cursor", "limit", "fields"}
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+def parse_int(params, name, default=None, minimum=None):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise InvalidQuery(f"'{name}' must be an integer")
+    if minimum is not None and value < minimum:
+        raise InvalidQuery(f"'{name}' must be at least {minimum}")
+    return value
+
+
+def parse_float(params, name, default=None, minimum=None, maximum=None, required=False):
+    raw = params.get(name)
+    if raw in (None, ""):
+        if required:
+            raise InvalidQuery(f"'{name}' is required")
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        raise InvalidQuery(f"'{name}' must be a number")
+    if not math.isfinite(value) or (minimum is not None and value < minimum) or (
+            maximum is not None and value > maximum):
+        raise InvalidQuery(f"'{name}' is out of range")
+    return value
+
+
+def parse_page(params):
+    """Return ``(cursor, limit)`` from the query string."""
+    cursor = parse_int(params, "cursor", default=0, minimum=0)
+    limit = parse_int(params, "limit", default=DEFAULT_PAGE_SIZE, minimum=1)
+    return cursor, min(limit, MAX_PAGE_SIZE)
+
+
+def parse_fields(params, allowed, default):
+    """Return the projected field names from ``fields=a,b``, validated against ``allowed``."""
+    raw = params.get("fields")
+    if not raw:
+        return list(default)
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def wants_page(params, filters=()):
+    return any(name in params for name in PAGE_PARAMS.union(filters))
+
+
+def paginate_list(items, params, allowed_fields, default_fields, predicate=None, extra=None):
+    """
+    Keyset-paginate and project an in-memory list of dicts that carry an
+    ``id``. ``extra``, if given, maps the page's (unprojected) items to
+    dicts merged into the projected rows. Returns ``(page, next_cursor)``.
+    """
+    cursor, limit = parse_page(params)
+    fields = parse_fields(params, allowed_fields, default_fields)
+    matching = sorted(
+        (item for item in items
+         if item.get("id", 0) > cursor and (predicate is None or predicate(item))),
+        key=lambda item: item["id"])
+    page = matching[:limit]
+    next_cursor = page[-1]["id"] if len(matching) > limit else None
+    rows = [{field: item.get(field) for field in fields} for item in page]
+    if extra is not None:
+        rows = [dict(row, **added) for row, added in zip(rows, extra(page))]
+    return rows, next_cursor
@@ -0,0 +1,182 @@
+# djangoapp/replica.py
+#
+# Local read replica of the dealer/review API (ReplicaDealer, ReplicaReview).
+# sync() pulls dealers in full and reviews incrementally past a cursor
+# (ReplicaSyncState) that only the sync advances; add_review adds each
+# posted review without moving it, so a review it fails to add is still
+# pulled by the next sync. With
+# settings.REPLICA_MODE on, dealer_cache and the review views read these
+# tables instead of calling the Node service.
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import ReplicaDealer, ReplicaReview, ReplicaSyncState
+from .restapis import (
+    SENTIMENT_LABELS,
+    analyze_review_sentiments_batch,
+    backend_url,
+    get_request,
+    unscored_reviews,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+DEALER_FIELDS = ("full_name", "short_name", "city", "state", "st", "address", "zip", "lat", "long")
+REVIEW_FIELDS = ("dealership", "name", "review", "purchase", "purchase_date",
+                 "car_make", "car_model", "car_year", "sentiment")
+STATE_ID = 1
+DEFAULT_BATCH_SIZE = 500
+READ_CHUNK_SIZE = 500
+
+
+def enabled():
+    return getattr(settings, "REPLICA_MODE", False)
+
+
+def _dealer_row(dealer):
+    return ReplicaDealer(id=int(dealer["id"]),
+                         **{field: str(dealer.get(field) or "") for field in DEALER_FIELDS})
+
+
+def _review_row(review):
+    car_year = review.get("car_year")
+    return ReplicaReview(
+        id=int(review["id"]),
+        dealership=int(review["dealership"]),
+        name=review.get("name") or "",
+        review=review.get("review") or "",
+        purchase=bool(review.get("purchase")),
+        purchase_date=review.get("purchase_date") or "",
+        car_make=review.get("car_make") or "",
+        car_model=review.get("car_model") or "",
+        car_year=int(car_year) if str(car_year or "").isdigit() else None,
+        sentiment=review["sentiment"] if review.get("sentiment") in SENTIMENT_LABELS else "",
+    )
+
+
+def _upsert_reviews(rows):
+    ReplicaReview.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=["id"], update_fields=list(REVIEW_FIELDS))
+
+
+def sync_dealers():
+    """Replace the dealer replica with /fetchDealers. Returns the count, or None on failure."""
+    dealers = get_request(f"{backend_url}/fetchDealers")
+    if dealers is None:
+        return None
+    rows = [_dealer_row(dealer) for dealer in dealers if "id" in dealer]
+    with transaction.atomic():
+        ReplicaDealer.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=["id"], update_fields=list(DEALER_FIELDS))
+        ReplicaDealer.objects.exclude(id__in=[row.id for row in rows]).delete()
+    return len(rows)
+
+
+def high_water_mark():
+    cursor = (ReplicaSyncState.objects.filter(pk=STATE_ID)
+              .values_list("review_cursor", flat=True).first())
+    return cursor or 0
+
+
+def _advance_cursor(review_id):
+    if not ReplicaSyncState.objects.filter(pk=STATE_ID).update(review_cursor=review_id):
+        ReplicaSyncState.objects.create(pk=STATE_ID, review_cursor=review_id)
+
+
+def sync_reviews(batch_size=DEFAULT_BATCH_SIZE, full=False):
+    """
+    Copy reviews with an id above the sync cursor, ``batch_size`` per
+    request, scoring legacy reviews that have no stored sentiment. The
+    cursor moves with each stored page. With ``full`` every review is
+    re-pulled (picking up upstream edits such as backfilled sentiment).
+    Returns ``{"since_id", "pulled", "scored"}``, or None if the first
+    page could not be fetched.
+    """
+    since_id = 0 if full else high_water_mark()
+    summary = {"since_id": since_id, "pulled": 0, "scored": 0}
+    while True:
+        page = get_request(f"{backend_url}/fetchReviews", since_id=since_id, limit=batch_size)
+        if page is None:
+            if summary["pulled"] == 0:
+                return None
+            logger.error(f"Replica review sync stopped after id {since_id}; "
+                         "the next run resumes there.")
+            break
+        page = [review for review in page if "id" in review and "dealership" in review]
+        if not page:
+            break
+        unscored = unscored_reviews(page)
+        if unscored:
+            labels = analyze_review_sentiments_batch(
+                [review.get("review", "") for review in unscored])
+            for review, label in zip(unscored, labels or []):
+                review["sentiment"] = label
+            summary["scored"] += len(unscored) if labels else 0
+        since_id = max(int(review["id"]) for review in page)
+        with transaction.atomic():
+            _upsert_reviews([_review_row(review) for review in page])
+            _advance_cursor(since_id)
+        summary["pulled"] += len(page)
+        if len(page) < batch_size:
+            break
+    return summary
+
+
+def sync(batch_size=DEFAULT_BATCH_SIZE, full=False):
+    """Sync dealers then reviews; returns ``{"dealers", "reviews"}`` (None entries failed)."""
+    return {"dealers": sync_dealers(), "reviews": sync_reviews(batch_size, full)}
+
+
+def record_review(review):
+    """
+    Add a review just inserted upstream (as returned by /insert_review).
+    The sync cursor is left alone, so sync_reviews still covers it.
+    """
+    _upsert_reviews([_review_row(review)])
+
+
+def dealers(state="All"):
+    rows = ReplicaDealer.objects.order_by("id")
+    if state != "All":
+        rows = rows.filter(state=state)
+    return [row.as_dict() for row in rows]
+
+
+def dealer(dealer_id):
+    try:
+        row = ReplicaDealer.objects.filter(id=int(dealer_id)).first()
+    except (TypeError, ValueError):
+        return None
+    return row.as_dict() if row is not None else None
+
+
+def _dealer_reviews(dealer_id):
+    try:
+        dealer_id = int(dealer_id)
+    except (TypeError, ValueError):
+        return ReplicaReview.objects.none()
+    return ReplicaReview.objects.filter(dealership=dealer_id).order_by("id")
+
+
+def dealer_reviews(dealer_id):
+    return [row.as_dict() for row in _dealer_reviews(dealer_id)]
+
+
+def iter_dealer_reviews(dealer_id):
+    for row in _dealer_reviews(dealer_id).iterator(chunk_size=READ_CHUNK_SIZE):
+        yield row.as_dict()
+
+
+async def aiter_dealer_reviews(dealer_id):
+    async for row in _dealer_reviews(dealer_id).aiterator(chunk_size=READ_CHUNK_SIZE):
+        yield row.as_dict()
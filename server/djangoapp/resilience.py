@@ -0,0 +1,210 @@
+# djangoapp/resilience.py
+#
+# Per-upstream circuit breakers, per-endpoint latency-derived timeouts and
+# jittered retry backoff for the outbound calls in restapis.py and
+# async_restapis.py.
+# State is per process; every worker learns an outage on its own within a
+# handful of calls.
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from requests.exceptions import RequestException
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+# Breaker: open when at least breaker_min_calls of the last breaker_window
+# calls were seen and breaker_failure_rate of them failed; after
+# breaker_open_seconds a single probe call decides between closed and open.
+breaker_window = int(os.getenv("breaker_window", "20"))
+breaker_min_calls = int(os.getenv("breaker_min_calls", "10"))
+breaker_failure_rate = float(os.getenv("breaker_failure_rate", "0.5"))
+breaker_open_seconds = float(os.getenv("breaker_open_seconds", "30"))
+
+# Timeouts: upstream_timeout_multiplier x the observed p99 latency of the
+# same endpoint (path template), clamped to [upstream_timeout_min,
+# upstream_timeout_max]; upstream_timeout_max is also used until enough
+# samples have been seen. Tracking per endpoint keeps small lookups such as
+# /fetchDealer/:id from setting the timeout for bulk /fetchReviews pulls.
+upstream_timeout_min = float(os.getenv("upstream_timeout_min", "1.0"))
+upstream_timeout_max = float(os.getenv("upstream_timeout_max", "10.0"))
+upstream_timeout_multiplier = float(os.getenv("upstream_timeout_multiplier", "3.0"))
+latency_window = int(os.getenv("upstream_latency_window", "200"))
+latency_min_samples = 20
+
+# Retries (idempotent GETs only) with full-jitter exponential backoff
+upstream_retries = int(os.getenv("upstream_retries", "2"))
+retry_backoff_base = float(os.getenv("upstream_retry_backoff", "0.1"))
+retry_backoff_cap = 1.0
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker with closed, open and half-open states.
+    ``clock`` returns seconds (time.monotonic unless a test injects one).
+    """
+
+    def __init__(self, name, clock=time.monotonic):
+        self.name = name
+        self.clock = clock
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=breaker_window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self._opened_at >= breaker_open_seconds:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, success):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if success:
+                    logger.info(f"Circuit for {self.name} closed after a successful probe.")
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._trip()
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (self.state == CLOSED and len(self._outcomes) >= breaker_min_calls
+                    and failures / len(self._outcomes) >= breaker_failure_rate):
+                self._trip()
+
+    def _trip(self):
+        logger.warning(f"Circuit for {self.name} opened; failing fast for {breaker_open_seconds}s.")
+        self.state = OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+
+
+class LatencyTracker:
+    """Recent successful call durations, used to size the next timeout."""
+
+    def __init__(self):
+        self._samples = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+
+    def observe(self, duration):
+        with self._lock:
+            self._samples.append(duration)
+
+    def percentile(self, pct):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(pct / 100.0 * len(samples)))]
+
+    def timeout(self):
+        with self._lock:
+            enough = len(self._samples) >= latency_min_samples
+        if not enough:
+            return upstream_timeout_max
+        return min(upstream_timeout_max,
+                   max(upstream_timeout_min, self.percentile(99) * upstream_timeout_multiplier))
+
+
+class Upstream:
+    """One host: a shared circuit breaker and a latency tracker per endpoint."""
+
+    def __init__(self, name):
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    def latency(self, endpoint):
+        with self._lock:
+            if endpoint not in self._latency:
+                self._latency[endpoint] = LatencyTracker()
+            return self._latency[endpoint]
+
+    def endpoints(self):
+        with self._lock:
+            return sorted(self._latency.items())
+
+    def before_call(self, endpoint):
+        """Return the timeout for the next call to ``endpoint``, or raise CircuitOpenError."""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        return self.latency(endpoint).timeout()
+
+    def after_call(self, endpoint, success, duration):
+        self.breaker.record(success)
+        if success:
+            self.latency(endpoint).observe(duration)
+
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def upstream(name):
+    with _upstreams_lock:
+        if name not in _upstreams:
+            _upstreams[name] = Upstream(name)
+        return _upstreams[name]
+
+
+def attempts_for(method):
+    return 1 + upstream_retries if method.upper() == "GET" else 1
+
+
+def backoff(attempt):
+    """Full-jitter delay before retry number ``attempt`` (1-based)."""
+    return random.uniform(0, min(retry_backoff_cap, retry_backoff_base * 2 ** (attempt - 1)))
+
+
+def is_failure(status):
+    """Network errors (status 0) and 5xx responses count against the breaker."""
+    return status == 0 or status >= 500
+
+
+def states():
+    with _upstreams_lock:
+        items = sorted(_upstreams.items())
+    return {name: item.breaker.state for name, item in items}
+
+
+def render_metrics():
+    lines = ["# TYPE djangoapp_circuit_state gauge"]
+    for name, state in states().items():
+        lines.append(f'djangoapp_circuit_state{{upstream="{name}"}} {STATE_VALUES[state]}')
+    with _upstreams_lock:
+        items = sorted(_upstreams.items())
+    lines.append("# TYPE djangoapp_upstream_timeout_seconds gauge")
+    for name, item in items:
+        for endpoint, tracker in item.endpoints():
+            labels = f'upstream="{name}",endpoint="{endpoint}"'
+            lines.append(f"djangoapp_upstream_timeout_seconds{{{labels}}} {tracker.timeout()}")
+    return lines
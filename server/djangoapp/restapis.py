@@ -1,11 +1,26 @@
 # djangoapp/restapis.py
 
 import requests
+import codecs
+import copy
 import os
+import re
+import time
+import hashlib
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.db import close_old_connections
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 import logging
 import json
+from . import metrics, resilience
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -23,15 +38,369 @@ load_dotenv()
 # Retrieve environment variables
 backend_url = os.getenv("backend_url", "http://localhost:3030")
 sentiment_analyzer_url = os.getenv("sentiment_analyzer_url", "http://localhost:5050/analyze")
+sentiment_batch_url = os.getenv(
+    "sentiment_batch_url", f"{sentiment_analyzer_url.rstrip('/')}_batch")
 searchcars_url = os.getenv('searchcars_url', default="http://localhost:3050/")
+sentiment_cache_size = int(os.getenv("sentiment_cache_size", "10000"))
+sentiment_batch_size = int(os.getenv("sentiment_batch_size", "100"))
+
+# Connection pooling: one pool per upstream host (http_pool_connections),
+# at most http_pool_maxsize keep-alive connections per host.
+http_pool_connections = int(os.getenv("http_pool_connections", "10"))
+http_pool_maxsize = int(os.getenv("http_pool_maxsize", "20"))
+http_fanout_workers = int(os.getenv("http_fanout_workers", "16"))
+
+# Single-flight: identical concurrent GETs share one upstream call. With
+# singleflight_cache set to a shared cache alias (e.g. "default" on Redis)
+# the coalescing also spans processes.
+singleflight_cache = os.getenv("singleflight_cache", "")
+singleflight_wait = float(os.getenv("singleflight_wait", "10"))
+singleflight_result_ttl = int(os.getenv("singleflight_result_ttl", "2"))
+
+# Streaming mode reads upstream bodies in chunks of this many bytes
+stream_chunk_bytes = int(os.getenv("stream_chunk_bytes", "65536"))
 
 logger.info(f"Using backend_url: {backend_url}")
 logger.info(f"Using sentiment_analyzer_url: {sentiment_analyzer_url}")
+logger.info(f"Using sentiment_batch_url: {sentiment_batch_url}")
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=http_pool_connections,
+        pool_maxsize=http_pool_maxsize,
+        pool_block=True,  # Enforce the per-host limit instead of opening extra sockets
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+http_session = _build_session()
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def upstream_name(url):
+    if url.startswith(sentiment_analyzer_url) or url.startswith(sentiment_batch_url):
+        return "sentiment"
+    if url.startswith(searchcars_url.rstrip("/")):
+        return "inventory"
+    if url.startswith(backend_url):
+        return "backend"
+    return "other"
+
+
+def url_template(url):
+    """Path of ``url`` with the query dropped and numeric segments replaced by ``:id``."""
+    path = re.sub(r"^[a-z]+://[^/]+", "", url.split("?", 1)[0])
+    path = re.sub(r"/+", "/", path)
+    if path.startswith("/analyze/"):
+        return "/analyze/:text"
+    return _ID_SEGMENT.sub("/:id", path) or "/"
+
+
+def send(method, url, **kwargs):
+    """
+    Issue a request on the pooled session and record its timing for metrics.
+    Calls go through the upstream's circuit breaker (raising
+    CircuitOpenError while it is open), get a timeout derived from recent
+    latency unless one is given, and idempotent GETs are retried with
+    jittered backoff on network errors and 5xx responses.
+    """
+    upstream = resilience.upstream(upstream_name(url))
+    attempts = resilience.attempts_for(method)
+    for attempt in range(1, attempts + 1):
+        timeout = upstream.before_call(url_template(url))
+        started = time.perf_counter()
+        status, nbytes = 0, 0
+        try:
+            response = http_session.request(method, url, **dict({"timeout": timeout}, **kwargs))
+            status, nbytes = response.status_code, len(response.content)
+        except RequestException:
+            if attempt == attempts:
+                raise
+        finally:
+            duration = time.perf_counter() - started
+            metrics.record_upstream(
+                upstream.name, method, url_template(url), status, nbytes, duration)
+            upstream.after_call(url_template(url), not resilience.is_failure(status), duration)
+        if not resilience.is_failure(status) or attempt == attempts:
+            return response
+        delay = resilience.backoff(attempt)
+        logger.warning(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt} failed)")
+        time.sleep(delay)
+
+
+def stream_get(url):
+    """
+    Start a streamed GET through the upstream's circuit breaker. Returns an
+    iterator of decoded text chunks once the response headers are in, or
+    None if the call failed. Streams are not retried, since part of the
+    body may already have been passed on; metrics and the breaker record
+    the call when the body has been read.
+    """
+    upstream = resilience.upstream(upstream_name(url))
+    logger.info(f"Streaming GET from {url}")
+    started = time.perf_counter()
+    try:
+        timeout = upstream.before_call(url_template(url))
+        response = http_session.get(url, stream=True, timeout=timeout)
+    except RequestException as e:
+        record_stream_call(upstream, url, 0, 0, started)
+        logger.error(f"Error starting streamed GET to {url}: {e}")
+        return None
+    if response.status_code >= 400:
+        response.close()
+        record_stream_call(upstream, url, response.status_code, 0, started)
+        logger.error(f"Streamed GET to {url} failed with status {response.status_code}")
+        return None
+    return _stream_chunks(upstream, url, response, started)
+
+
+def _stream_chunks(upstream, url, response, started):
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    status, nbytes = response.status_code, 0
+    try:
+        for raw in response.iter_content(stream_chunk_bytes):
+            nbytes += len(raw)
+            yield decoder.decode(raw)
+        yield decoder.decode(b"", final=True)
+    except RequestException:
+        status = 0
+        raise
+    finally:
+        response.close()
+        record_stream_call(upstream, url, status, nbytes, started)
+
+
+def record_stream_call(upstream, url, status, nbytes, started):
+    duration = time.perf_counter() - started
+    endpoint = url_template(url)
+    metrics.record_upstream(upstream.name, "GET", endpoint, status, nbytes, duration)
+    upstream.after_call(endpoint, not resilience.is_failure(status), duration)
+
+
+_fanout_executor = ThreadPoolExecutor(
+    max_workers=http_fanout_workers, thread_name_prefix="restapis-fanout")
+_fanout_state = threading.local()
+
+
+def _run_fanout_call(call):
+    # Restore rather than clear: an inline nested call runs on a pool thread
+    previous = getattr(_fanout_state, "active", False)
+    _fanout_state.active = True
+    try:
+        return call()
+    except Exception:
+        logger.exception("Fan-out call failed")
+        return None
+    finally:
+        _fanout_state.active = previous
+
+
+def _run_pooled_call(call):
+    # Pool threads keep their own database connections (replica reads), so
+    # recycle them around each call the way Django does around a request
+    close_old_connections()
+    try:
+        return _run_fanout_call(call)
+    finally:
+        close_old_connections()
+
+
+def fan_out(calls):
+    """
+    Run zero-argument callables concurrently on the shared worker pool and
+    return their results in input order. A call that raises yields None.
+    Nested fan-outs run inline so the pool can never deadlock on itself.
+    """
+    calls = list(calls)
+    if len(calls) <= 1 or getattr(_fanout_state, "active", False):
+        return [_run_fanout_call(call) for call in calls]
+    # Copy the caller's context so per-request timings see calls made on the pool
+    futures = [_fanout_executor.submit(contextvars.copy_context().run, _run_pooled_call, call)
+               for call in calls]
+    return [future.result() for future in futures]
+
+
+class SentimentCache:
+    """
+    Sentiment labels keyed by a SHA-256 of the normalized review text.
+    A bounded in-process LRU sits in front of the Django cache alias
+    ``sentiment`` (a SQLite table by default), so scores survive restarts
+    and are shared between workers.
+    """
+
+    def __init__(self, max_entries, alias="sentiment"):
+        self.max_entries = max_entries
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(text):
+        normalized = " ".join(str(text).split())
+        return "sentiment:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _shared(self):
+        return caches[self.alias]
+
+    def _remember(self, entries):
+        with self._lock:
+            for key, label in entries.items():
+                self._entries[key] = label
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_many(self, keys):
+        """Return ``{key: label}`` for the keys that are cached."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+        missing = [key for key in keys if key not in found]
+        if missing:
+            try:
+                shared = self._shared().get_many(missing)
+            except Exception as e:
+                logger.warning(f"Shared sentiment cache unavailable: {e}")
+                shared = {}
+            if shared:
+                self._remember(shared)
+                found.update(shared)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, entries):
+        if not entries:
+            return
+        self._remember(entries)
+        try:
+            self._shared().set_many(entries, timeout=None)
+        except Exception as e:
+            logger.warning(f"Shared sentiment cache unavailable: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+sentiment_cache = SentimentCache(sentiment_cache_size)
+
+_MISSING = object()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution whose
+    result every caller receives (as its own deep copy, since views mutate
+    the payloads). Optionally coordinates across processes through a lock
+    and a short-lived result entry in a shared Django cache.
+    """
+
+    def __init__(self, cache_alias=""):
+        self.cache_alias = cache_alias
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+        if leader:
+            try:
+                flight.result = self._run_shared(key, fn)
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+        return copy.deepcopy(flight.result)
+
+    def _cache(self):
+        if not self.cache_alias:
+            return None
+        try:
+            return caches[self.cache_alias]
+        except InvalidCacheBackendError:
+            logger.warning(f"Unknown single-flight cache alias '{self.cache_alias}'")
+            return None
+
+    def _run_shared(self, key, fn):
+        cache = self._cache()
+        if cache is None:
+            return fn()
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        lock_key, result_key = f"singleflight:{digest}:lock", f"singleflight:{digest}:result"
+        try:
+            if not cache.add(lock_key, True, timeout=int(singleflight_wait) + 1):
+                # Another process is fetching; wait for its result, then fall back
+                deadline = time.monotonic() + singleflight_wait
+                while time.monotonic() < deadline:
+                    found = cache.get(result_key, _MISSING)
+                    if found is not _MISSING:
+                        with self._lock:
+                            self.shared += 1
+                        return found
+                    time.sleep(0.02)
+                return fn()
+            cache.delete(result_key)
+        except Exception as e:
+            logger.warning(f"Shared single-flight cache unavailable: {e}")
+            return fn()
+        try:
+            result = fn()
+            cache.set(result_key, result, timeout=singleflight_result_ttl)
+            return result
+        finally:
+            cache.delete(lock_key)
+
+
+single_flight = SingleFlight(singleflight_cache)
+
 
 def get_request(url, **kwargs):
+    """GET ``url`` and return its JSON, or None; identical concurrent calls share one request."""
+    key = ("GET", url, tuple(sorted(kwargs.items())))
+    return single_flight.do(key, lambda: _get_request(url, **kwargs))
+
+
+def _get_request(url, **kwargs):
     try:
         logger.info(f"Making GET request to URL: {url}")
-        response = requests.get(url, params=kwargs, timeout=10)
+        response = send("GET", url, params=kwargs)
         response.raise_for_status()
         logger.debug(f"GET request successful. Status Code: {response.status_code}")
         return response.json()
@@ -42,14 +411,46 @@ def get_request(url, **kwargs):
         logger.error(f"JSON decode error for GET request to {url}: {e}")
         return None
 
+
+_engine_failed = False
+
+
+def embedded_sentiment_engine():
+    """
+    The in-process VADER engine when settings.SENTIMENT_BACKEND is
+    "embedded", otherwise None (score over HTTP). Falls back to HTTP, with
+    an error logged once, if the engine cannot be loaded.
+    """
+    global _engine_failed
+    if getattr(settings, "SENTIMENT_BACKEND", "http") != "embedded" or _engine_failed:
+        return None
+    try:
+        from .microservices.sentiment_engine import get_engine
+        return get_engine()
+    except (ImportError, LookupError) as e:
+        _engine_failed = True
+        logger.error(f"Embedded sentiment engine unavailable, using HTTP: {e}")
+        return None
+
+
 def analyze_review_sentiments(text):
+    engine = embedded_sentiment_engine()
+    if engine is not None:
+        return {"sentiment": engine.label(str(text))}
+    key = SentimentCache.key_for(text)
+    cached = sentiment_cache.get_many([key])
+    if key in cached:
+        return {"sentiment": cached[key]}
     request_url = f"{sentiment_analyzer_url}?text={text}"
     logger.info(f"Sentiment analysis request to {request_url}")
     try:
-        response = requests.get(request_url, timeout=10)
+        response = send("GET", request_url)
         response.raise_for_status()
         logger.debug("Sentiment analysis successful.")
-        return response.json()
+        result = response.json()
+        if result.get("sentiment"):
+            sentiment_cache.set_many({key: result["sentiment"]})
+        return result
     except RequestException as e:
         logger.error(f"Sentiment analysis failed: {e}")
         return None
@@ -57,22 +458,178 @@ def analyze_review_sentiments(text):
         logger.error(f"JSON decode error for sentiment analysis: {e}")
         return None
 
+
+def analyze_review_sentiments_batch(texts):
+    """
+    Score many review texts with a single POST to the sentiment service.
+    Returns a list of sentiment labels in the same order as ``texts``,
+    or None if the batch call failed.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    engine = embedded_sentiment_engine()
+    if engine is not None:
+        # Cheaper than a cache round trip; the engine memoizes labels itself
+        return engine.label_many(texts)
+    keys, labels, pending = split_cached_sentiments(texts)
+    if pending:
+        chunks = sentiment_chunks(list(pending.values()))
+        results = fan_out([lambda chunk=chunk: _score_batch(chunk) for chunk in chunks])
+        if any(result is None for result in results):
+            return None
+        scored = [label for result in results for label in result]
+        fresh = dict(zip(pending.keys(), scored))
+        sentiment_cache.set_many(fresh)
+        labels.update(fresh)
+    return [labels[key] for key in keys]
+
+
+def split_cached_sentiments(texts):
+    """
+    Look ``texts`` up in the sentiment cache. Returns ``(keys, labels,
+    pending)`` where ``labels`` maps cached keys to labels and ``pending``
+    maps each uncached key to its text, once per distinct text.
+    """
+    keys = [SentimentCache.key_for(text) for text in texts]
+    labels = sentiment_cache.get_many(keys)
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key not in labels:
+            pending.setdefault(key, text)
+    return keys, labels, pending
+
+
+def sentiment_chunks(texts):
+    return [texts[start:start + sentiment_batch_size]
+            for start in range(0, len(texts), sentiment_batch_size)]
+
+
+def parse_sentiment_batch(payload, expected):
+    sentiments = payload.get("sentiments") if isinstance(payload, dict) else None
+    if not isinstance(sentiments, list) or len(sentiments) != expected:
+        logger.error("Batch sentiment analysis returned a mismatched result list.")
+        return None
+    return sentiments
+
+
+def _score_batch(texts):
+    logger.info(f"Batch sentiment analysis request to {sentiment_batch_url} ({len(texts)} texts)")
+    try:
+        response = send("POST", sentiment_batch_url, json={"texts": texts})
+        response.raise_for_status()
+        sentiments = parse_sentiment_batch(response.json(), len(texts))
+    except RequestException as e:
+        logger.error(f"Batch sentiment analysis failed: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error for batch sentiment analysis: {e}")
+        return None
+    if sentiments is not None:
+        logger.debug("Batch sentiment analysis successful.")
+    return sentiments
+
+
+def warm_sentiment_cache(batch_size=200):
+    """
+    Pre-score every review returned by ``/fetchReviews`` so page views hit
+    the cache. Returns a summary dict with the number of reviews seen and
+    how many missed the cache, or None if the reviews could not be fetched.
+    """
+    reviews = get_request(f"{backend_url}/fetchReviews")
+    if reviews is None:
+        return None
+    texts = [review.get("review", "") for review in reviews]
+    misses_before = sentiment_cache.misses
+    for start in range(0, len(texts), batch_size):
+        if analyze_review_sentiments_batch(texts[start:start + batch_size]) is None:
+            logger.error("Stopping sentiment cache warm-up after a failed batch.")
+            break
+    return {"reviews": len(texts), "cache_misses": sentiment_cache.misses - misses_before}
+
+
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+
+def has_stored_sentiment(review):
+    return review.get("sentiment") in SENTIMENT_LABELS
+
+
+def unscored_reviews(reviews):
+    """Reviews (legacy rows) that have no sentiment stored with them."""
+    return [review for review in reviews if not has_stored_sentiment(review)]
+
+
+def _backfill_batch(reviews):
+    labels = analyze_review_sentiments_batch([review.get("review", "") for review in reviews])
+    if labels is None:
+        return None
+    items = [{"id": review["id"], "sentiment": label} for review, label in zip(reviews, labels)]
+    try:
+        response = send("POST", f"{backend_url}/update_sentiments", json={"sentiments": items})
+        response.raise_for_status()
+        return len(items)
+    except RequestException as e:
+        logger.error(f"Failed to store backfilled sentiments: {e}")
+        return None
+
+
+def backfill_sentiments(batch_size=200):
+    """
+    Score every review from ``/fetchReviews`` that has no stored sentiment
+    and write the labels back through ``/update_sentiments``, batches in
+    parallel. Returns ``{"reviews", "missing", "updated", "failed_batches"}``,
+    or None if the reviews could not be fetched.
+    """
+    reviews = get_request(f"{backend_url}/fetchReviews")
+    if reviews is None:
+        return None
+    missing = [review for review in unscored_reviews(reviews) if "id" in review]
+    batches = [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+    results = fan_out([lambda batch=batch: _backfill_batch(batch) for batch in batches])
+    return {
+        "reviews": len(reviews),
+        "missing": len(missing),
+        "updated": sum(result for result in results if result),
+        "failed_batches": sum(1 for result in results if result is None),
+    }
+
+
+REVIEW_REQUIRED_FIELDS = [
+    "name", "dealership", "review", "purchase",
+    "purchase_date", "car_make", "car_model", "car_year"
+]
+
+
+def missing_review_fields(data_dict):
+    return [field for field in REVIEW_REQUIRED_FIELDS if field not in data_dict]
+
+
+def with_sentiment(data_dict, labels):
+    """
+    ``data_dict`` with its sentiment label. When scoring failed the review is
+    posted without one; a client-supplied label is never passed through.
+    """
+    if labels:
+        return dict(data_dict, sentiment=labels[0])
+    logger.warning("Posting review without sentiment; it will be scored on read.")
+    return {key: value for key, value in data_dict.items() if key != "sentiment"}
+
+
 def post_review(data_dict):
     request_url = f"{backend_url}/insert_review"  # No trailing slash
     logger.info(f"POST to {request_url} with data {data_dict}")
-    required_fields = [
-        "name", "dealership", "review", "purchase",
-        "purchase_date", "car_make", "car_model", "car_year"
-    ]
-    missing_fields = [field for field in required_fields if field not in data_dict]
+    missing_fields = missing_review_fields(data_dict)
     if missing_fields:
         logger.error(f"Validation error: Missing fields - {missing_fields}")
         return {
             "status": "Failed",
             "message": f"Missing required fields: {', '.join(missing_fields)}"
         }
+    # Sentiment depends only on the text, so score it once here and store it
+    data_dict = with_sentiment(data_dict, analyze_review_sentiments_batch([data_dict["review"]]))
     try:
-        response = requests.post(request_url, json=data_dict, timeout=10)
+        response = send("POST", request_url, json=data_dict)
         response.raise_for_status()
         logger.debug(f"POST request successful. Status Code: {response.status_code}")
         return response.json()
@@ -83,26 +640,81 @@ def post_review(data_dict):
         logger.error(f"JSON decode error for POST request to {request_url}: {e}")
         return {"status": "Failed", "message": "Invalid JSON response"}
 
-def searchcars_request(endpoint, **kwargs):
+
+def post_reviews(reviews):
+    """
+    Insert many reviews with one POST to ``/insert_reviews``, scoring their
+    sentiment in one batch. Returns a list in the order of ``reviews``: the
+    stored review (with its ``id``), or a ``{"status": "Failed", ...}`` dict
+    for a review that was not inserted.
+    """
+    results = [None] * len(reviews)
+    valid = []
+    for index, review in enumerate(reviews):
+        missing_fields = missing_review_fields(review)
+        if missing_fields:
+            results[index] = {
+                "status": "Failed",
+                "message": f"Missing required fields: {', '.join(missing_fields)}"
+            }
+        else:
+            valid.append(index)
+    if not valid:
+        return results
+    labels = analyze_review_sentiments_batch([reviews[index]["review"] for index in valid])
+    payload = [with_sentiment(reviews[index], [labels[position]] if labels else None)
+               for position, index in enumerate(valid)]
+    request_url = f"{backend_url}/insert_reviews"
+    logger.info(f"POST to {request_url} with {len(payload)} reviews")
+    try:
+        response = send("POST", request_url, json={"reviews": payload})
+        response.raise_for_status()
+        stored = response.json()["reviews"]
+    except RequestException as e:
+        logger.error(f"Failed to post reviews: {e}")
+        stored = [{"status": "Failed", "message": "Network exception occurred"}] * len(valid)
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        logger.error(f"Invalid response for POST request to {request_url}: {e}")
+        stored = [{"status": "Failed", "message": "Invalid JSON response"}] * len(valid)
+    for index, review in zip(valid, stored):
+        results[index] = review or {
+            "status": "Failed", "message": "Review rejected by the database service"}
+    return results
+
+
+def searchcars_request_url(endpoint, **kwargs):
     params = ""
     if kwargs:
         # Construct query string parameters (if any)
         for key, value in kwargs.items():
             params += f"{key}={value}&"
     # Build the full URL by concatenating the searchcars_url, endpoint, and query parameters
-    request_url = searchcars_url + endpoint + "?" + params
-    print("GET from {}".format(request_url))
+    return searchcars_url + endpoint + "?" + params
+
+
+def searchcars_request(endpoint, **kwargs):
+    request_url = searchcars_request_url(endpoint, **kwargs)
+    logger.info(f"GET from {request_url}")
     try:
-        response = requests.get(request_url)
+        response = send("GET", request_url)
         return response.json()
-    except Exception as e:
-        print("Network exception occurred:", e)
-    finally:
-        print("GET request call complete!")
+    except (RequestException, json.JSONDecodeError) as e:
+        logger.error(f"Network exception occurred: {e}")
+        return None
+
 
 __all__ = [
     'backend_url',
+    'fan_out',
+    'http_session',
     'get_request',
+    'single_flight',
+    'stream_get',
     'post_review',
-    'analyze_review_sentiments'
+    'analyze_review_sentiments',
+    'analyze_review_sentiments_batch',
+    'backfill_sentiments',
+    'embedded_sentiment_engine',
+    'sentiment_cache',
+    'warm_sentiment_cache'
 ]
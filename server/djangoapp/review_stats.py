@@ -0,0 +1,142 @@
+# djangoapp/review_stats.py
+#
+# Per-dealer review aggregates (DealerReviewStats). add_review bumps them
+# incrementally; rebuild() recomputes every row from /fetchReviews, using
+# stored sentiment labels and scoring only legacy reviews without one.
+
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import DealerReviewStats
+from .restapis import (
+    SENTIMENT_LABELS,
+    analyze_review_sentiments_batch,
+    backend_url,
+    get_request,
+    has_stored_sentiment,
+    unscored_reviews,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+EMPTY_STATS = {
+    "review_count": 0,
+    "positive": 0,
+    "neutral": 0,
+    "negative": 0,
+    "last_review_id": None,
+    "last_review_at": None,
+}
+
+
+def _label(review):
+    # Reviews that could not be scored count as neutral, as on the read path
+    return review["sentiment"] if has_stored_sentiment(review) else "neutral"
+
+
+def record_review(review):
+    """Add one newly inserted review (as returned by /insert_review) to its dealer's aggregate."""
+    dealer_id = int(review["dealership"])
+    updates = {
+        "review_count": F("review_count") + 1,
+        f"{_label(review)}_count": F(f"{_label(review)}_count") + 1,
+        "last_review_at": timezone.now(),
+    }
+    if review.get("id") is not None:
+        updates["last_review_id"] = Greatest(
+            Coalesce(F("last_review_id"), Value(0)), Value(int(review["id"])))
+    with transaction.atomic():
+        DealerReviewStats.objects.get_or_create(dealer_id=dealer_id)
+        DealerReviewStats.objects.filter(dealer_id=dealer_id).update(**updates)
+
+
+def stats_for(dealer_ids):
+    """``{dealer_id: stats dict}`` for ``dealer_ids``, zeros for dealers without reviews."""
+    rows = DealerReviewStats.objects.filter(dealer_id__in=list(dealer_ids))
+    found = {row.dealer_id: row.as_dict() for row in rows}
+    return {dealer_id: found.get(dealer_id, dict(EMPTY_STATS)) for dealer_id in dealer_ids}
+
+
+def _score_unscored(reviews):
+    unscored = unscored_reviews(reviews)
+    if unscored:
+        labels = analyze_review_sentiments_batch([review.get("review", "") for review in unscored])
+        for review, label in zip(unscored, labels or []):
+            review["sentiment"] = label
+    return len(unscored)
+
+
+def _tally(reviews, totals):
+    for review in reviews:
+        try:
+            dealer_id = int(review["dealership"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        row = totals[dealer_id]
+        row["review_count"] += 1
+        row[f"{_label(review)}_count"] += 1
+        if review.get("id") is not None:
+            row["last_review_id"] = max(row["last_review_id"] or 0, int(review["id"]))
+
+
+class _TailUnavailable(Exception):
+    pass
+
+
+def rebuild():
+    """
+    Recompute every dealer's aggregate from the full review corpus. Returns
+    ``{"reviews", "dealers", "scored"}``, or None if the reviews could not be
+    fetched. Recorded last_review_at values are kept.
+
+    The corpus is fetched without holding any lock. The swap then runs in
+    one transaction that first locks the stats rows, so record_review calls
+    wait for it rather than landing in rows about to be replaced. Inside
+    it, reviews inserted since the corpus was read are pulled
+    (``since_id``) and counted, so no review posted meanwhile is lost.
+    """
+    reviews = get_request(f"{backend_url}/fetchReviews")
+    if reviews is None:
+        return None
+    scored = _score_unscored(reviews)
+    totals = defaultdict(lambda: {"review_count": 0, "last_review_id": None,
+                                  **{f"{label}_count": 0 for label in SENTIMENT_LABELS}})
+    _tally(reviews, totals)
+    since_id = max((int(review["id"]) for review in reviews if review.get("id") is not None),
+                   default=0)
+
+    try:
+        with transaction.atomic():
+            # Locks the rows (SQLite: the IMMEDIATE transaction locks the database)
+            existing = dict(DealerReviewStats.objects.select_for_update()
+                            .values_list("dealer_id", "last_review_at"))
+            tail = get_request(f"{backend_url}/fetchReviews", since_id=since_id)
+            if tail is None:
+                raise _TailUnavailable()
+            tail = [review for review in tail if int(review.get("id") or 0) > since_id]
+            scored += _score_unscored(tail)
+            _tally(tail, totals)
+            DealerReviewStats.objects.all().delete()
+            DealerReviewStats.objects.bulk_create([
+                DealerReviewStats(dealer_id=dealer_id, last_review_at=existing.get(dealer_id),
+                                  **row)
+                for dealer_id, row in totals.items()
+            ])
+    except _TailUnavailable:
+        logger.error("Could not fetch reviews posted during the stats rebuild; stats unchanged.")
+        return None
+    count = len(reviews) + len(tail)
+    logger.info(f"Rebuilt review stats for {len(totals)} dealers from {count} reviews.")
+    return {"reviews": count, "dealers": len(totals), "scored": scored}
@@ -0,0 +1,14 @@
+# djangoapp/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import catalog
+from .models import CarMake, CarModel
+
+
+@receiver(post_save, sender=CarMake)
+@receiver(post_delete, sender=CarMake)
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+def rebuild_catalog_snapshot(sender, **kwargs):
+    catalog.schedule_rebuild()
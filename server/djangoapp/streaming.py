@@ -0,0 +1,201 @@
+# djangoapp/streaming.py
+#
+# Streaming mode for the list endpoints (?stream=json or ?stream=ndjson, or
+# "Accept: application/x-ndjson"). The upstream JSON array is parsed
+# incrementally as chunks arrive, items are transformed in small batches
+# and written out through StreamingHttpResponse, so memory stays bounded by
+# one batch and the first bytes go out before the upstream body has ended.
+# With stream=json the document is the same as the buffered response's.
+
+import json
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .pagination import InvalidQuery
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+FORMATS = ("json", "ndjson")
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+FLUSH_BYTES = 16384
+
+
+def stream_format(request):
+    """The requested streaming format, or None for a buffered response."""
+    fmt = request.GET.get("stream")
+    if not fmt:
+        return "ndjson" if NDJSON_CONTENT_TYPE in request.headers.get("Accept", "") else None
+    if fmt not in FORMATS:
+        raise InvalidQuery(f"'stream' must be one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+class JSONArrayParser:
+    """
+    Incremental parser for a top-level JSON array. ``feed()`` text chunks
+    and get back the items completed so far; only the unfinished tail of
+    the input is kept in memory.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "start"  # start -> first -> (value <-> after) -> done
+
+    def feed(self, text):
+        buffer = self._buffer + text
+        pos, items = 0, []
+        while self._state != "done":
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == "start":
+                if char != "[":
+                    raise ValueError("Upstream body is not a JSON array")
+                self._state, pos = "first", pos + 1
+            elif self._state in ("first", "after") and char == "]":
+                self._state, pos = "done", pos + 1
+            elif self._state == "after":
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                self._state, pos = "value", pos + 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # Item not complete yet
+                if (not isinstance(item, (dict, list, str))
+                        and (end == len(buffer) or buffer[end] not in " \t\r\n,]")):
+                    break  # A number may continue in the next chunk ("4" of "4.5")
+                items.append(item)
+                self._state, pos = "after", end
+        self._buffer = buffer[pos:]
+        return items
+
+    def close(self):
+        if self._state != "done":
+            raise ValueError("Upstream JSON array ended early")
+
+
+def iter_json_array(chunks):
+    parser = JSONArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
+
+
+async def aiter_json_array(chunks):
+    parser = JSONArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    parser.close()
+
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def abatched(items, size):
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def aiter_list(items):
+    for item in items:
+        yield item
+
+
+class StreamEncoder:
+    """
+    Writes items as one JSON document (``envelope`` fields plus the items
+    under ``key``) or as NDJSON, one item per line.
+    """
+
+    def __init__(self, fmt, key, envelope):
+        self.fmt = fmt
+        self.key = key
+        self.envelope = envelope
+        self._first = True
+
+    def start(self):
+        if self.fmt == "ndjson":
+            return ""
+        head = json.dumps(self.envelope, cls=DjangoJSONEncoder)[:-1]
+        return f'{head}{", " if self.envelope else ""}"{self.key}": ['
+
+    def item(self, obj):
+        text = json.dumps(obj, cls=DjangoJSONEncoder)
+        if self.fmt == "ndjson":
+            return text + "\n"
+        separator, self._first = ("" if self._first else ", "), False
+        return separator + text
+
+    def end(self):
+        return "" if self.fmt == "ndjson" else "]}"
+
+
+def encode(encoder, items):
+    buffer = encoder.start()
+    try:
+        for item in items:
+            buffer += encoder.item(item)
+            if len(buffer) >= FLUSH_BYTES:
+                yield buffer
+                buffer = ""
+    except Exception:
+        # Headers are sent; all we can do is end the body early
+        logger.exception("Streaming response aborted")
+        yield buffer
+        return
+    yield buffer + encoder.end()
+
+
+async def aencode(encoder, items):
+    buffer = encoder.start()
+    try:
+        async for item in items:
+            buffer += encoder.item(item)
+            if len(buffer) >= FLUSH_BYTES:
+                yield buffer
+                buffer = ""
+    except Exception:
+        logger.exception("Streaming response aborted")
+        yield buffer
+        return
+    yield buffer + encoder.end()
+
+
+def streaming_response(items, fmt, key, envelope=None):
+    """
+    StreamingHttpResponse over ``items`` (a sync or async iterable) in
+    ``fmt``; ``envelope`` defaults to ``{"status": 200}``.
+    """
+    encoder = StreamEncoder(fmt, key, {"status": 200} if envelope is None else envelope)
+    body = aencode(encoder, items) if hasattr(items, "__aiter__") else encode(encoder, items)
+    content_type = NDJSON_CONTENT_TYPE if fmt == "ndjson" else "application/json"
+    return StreamingHttpResponse(body, content_type=content_type)
@@ -0,0 +1,600 @@
+import importlib.util
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from urllib.parse import quote
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+
+from . import (
+    catalog, geo, inventory_index, loader, outbox, pagination, replica, resilience, restapis,
+    review_stats, streaming, views,
+)
+from .models import (
+    CarMake, CarModel, DealerReviewStats, PendingReview, ReplicaReview,
+)
+from .pagination import InvalidQuery
+
+
+class FanOutTests(SimpleTestCase):
+
+    def test_results_in_input_order(self):
+        self.assertEqual(restapis.fan_out([lambda i=i: i * 2 for i in range(5)]), [0, 2, 4, 6, 8])
+
+    def test_failed_call_yields_none(self):
+        with self.assertLogs("djangoapp.restapis", "ERROR"):
+            self.assertEqual(restapis.fan_out([lambda: 1, lambda: 1 / 0]), [1, None])
+
+    def test_nested_fan_out_keeps_pool_thread_inline(self):
+        # Each pool call fans out twice; the second nested fan-out must also run
+        # inline, or it waits on a pool whose workers are all busy waiting on it.
+        def call():
+            restapis.fan_out([lambda: 1, lambda: 2])
+            return restapis.fan_out([lambda: 3, lambda: 4])
+
+        results = []
+        pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            with mock.patch.object(restapis, "_fanout_executor", pool):
+                outer = threading.Thread(
+                    target=lambda: results.extend(restapis.fan_out([call, call])), daemon=True)
+                outer.start()
+                outer.join(timeout=5)
+                self.assertFalse(outer.is_alive(), "nested fan_out deadlocked the pool")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.assertEqual(results, [[3, 4], [3, 4]])
+        self.assertFalse(getattr(restapis._fanout_state, "active", False))
+
+
+class UpstreamTimeoutTests(SimpleTestCase):
+
+    def test_timeouts_are_tracked_per_endpoint(self):
+        upstream = resilience.Upstream("backend-test")
+        for _ in range(resilience.latency_min_samples):
+            upstream.after_call("/fetchDealer/:id", True, 0.01)
+        self.assertEqual(upstream.before_call("/fetchDealer/:id"), resilience.upstream_timeout_min)
+        # No samples for the bulk endpoint yet, so it keeps the full timeout
+        self.assertEqual(upstream.before_call("/fetchReviews"), resilience.upstream_timeout_max)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = resilience.CircuitBreaker("test", clock=self.clock)
+
+    def trip(self):
+        with self.assertLogs("djangoapp.resilience", "WARNING"):
+            for _ in range(resilience.breaker_min_calls):
+                self.breaker.record(False)
+
+    def test_failures_open_the_breaker(self):
+        for _ in range(resilience.breaker_min_calls - 1):
+            self.breaker.record(False)
+        self.assertEqual(self.breaker.state, resilience.CLOSED)
+        self.trip()
+        self.assertEqual(self.breaker.state, resilience.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_probe_closes_the_breaker(self):
+        self.trip()
+        self.clock.now += resilience.breaker_open_seconds
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, resilience.HALF_OPEN)
+        # Only one probe at a time
+        self.assertFalse(self.breaker.allow())
+        with self.assertLogs("djangoapp.resilience", "INFO"):
+            self.breaker.record(True)
+        self.assertEqual(self.breaker.state, resilience.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens_the_breaker(self):
+        self.trip()
+        self.clock.now += resilience.breaker_open_seconds
+        self.assertTrue(self.breaker.allow())
+        with self.assertLogs("djangoapp.resilience", "WARNING"):
+            self.breaker.record(False)
+        self.assertEqual(self.breaker.state, resilience.OPEN)
+        self.clock.now += resilience.breaker_open_seconds - 1
+        self.assertFalse(self.breaker.allow())
+
+
+@override_settings(SENTIMENT_BACKEND="http")
+class OpenCircuitFallbackTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(resilience, "_upstreams", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        session = mock.patch.object(restapis, "http_session")
+        self.session = session.start()
+        self.addCleanup(session.stop)
+
+    def open_circuit(self, name):
+        breaker = resilience.upstream(name).breaker
+        with self.assertLogs("djangoapp.resilience", "WARNING"):
+            breaker._trip()
+
+    def test_reviews_fall_back_to_neutral(self):
+        self.open_circuit("sentiment")
+        review = {"id": 1, "dealership": 1, "review": f"Unscored {uuid.uuid4().hex}"}
+        request = RequestFactory().get("/djangoapp/api/reviews/dealer/1/")
+        with mock.patch.object(views, "get_request", return_value=[review]), \
+                self.assertLogs("djangoapp.restapis", "ERROR"):
+            response = views.get_dealer_reviews(request, 1)
+        self.assertEqual(json.loads(response.content)["reviews"][0]["sentiment"], "neutral")
+        self.session.request.assert_not_called()
+
+    def test_dealer_page_is_partial(self):
+        self.open_circuit("inventory")
+        request = RequestFactory().get("/djangoapp/api/dealer/1/page/")
+        with mock.patch.object(views.dealer_cache, "get_dealer", return_value={"id": 1}), \
+                mock.patch.object(views, "fetch_scored_reviews", return_value=[]), \
+                self.assertLogs("djangoapp.restapis", "ERROR"), \
+                self.assertLogs("djangoapp.views", "WARNING"):
+            response = views.get_dealer_page(request, 1)
+        body = json.loads(response.content)
+        self.assertEqual((response.status_code, body["errors"]), (200, ["cars"]))
+        self.session.request.assert_not_called()
+
+
+class WithSentimentTests(SimpleTestCase):
+
+    def test_scored_label_replaces_client_label(self):
+        review = {"review": "Great", "sentiment": "negative"}
+        self.assertEqual(restapis.with_sentiment(review, ["positive"])["sentiment"], "positive")
+
+    def test_client_label_dropped_when_scoring_fails(self):
+        with self.assertLogs("djangoapp.restapis", "WARNING"):
+            self.assertNotIn("sentiment", restapis.with_sentiment(
+                {"review": "Great", "sentiment": "positive"}, None))
+
+
+class ReviewStatsRebuildTests(TestCase):
+
+    def test_reviews_posted_during_fetch_are_counted(self):
+        corpus = [{"id": 1, "dealership": 7, "sentiment": "positive"}]
+        tail = [{"id": 2, "dealership": 7, "sentiment": "negative"}]
+        with mock.patch.object(review_stats, "get_request", side_effect=[corpus, tail]) as get:
+            self.assertEqual(review_stats.rebuild()["reviews"], 2)
+        self.assertEqual(get.call_args.kwargs, {"since_id": 1})
+        row = DealerReviewStats.objects.get(dealer_id=7)
+        self.assertEqual((row.review_count, row.negative_count, row.last_review_id), (2, 1, 2))
+
+    def test_failed_tail_fetch_leaves_stats_unchanged(self):
+        DealerReviewStats.objects.create(dealer_id=7, review_count=5)
+        with mock.patch.object(review_stats, "get_request", side_effect=[[], None]):
+            with self.assertLogs("djangoapp.review_stats", "ERROR"):
+                self.assertIsNone(review_stats.rebuild())
+        self.assertEqual(DealerReviewStats.objects.get(dealer_id=7).review_count, 5)
+
+
+class ReplicaSyncTests(TestCase):
+
+    def test_local_review_does_not_skip_earlier_reviews(self):
+        # Review 5 is added locally while the replica missed review 4
+        replica.record_review({"id": 5, "dealership": 1, "review": "Late"})
+        upstream = [{"id": 4, "dealership": 1, "review": "Missed", "sentiment": "neutral"},
+                    {"id": 5, "dealership": 1, "review": "Late", "sentiment": "positive"}]
+        with mock.patch.object(replica, "get_request", return_value=upstream) as get:
+            self.assertEqual(replica.sync_reviews()["pulled"], 2)
+        self.assertEqual(get.call_args.kwargs["since_id"], 0)
+        self.assertTrue(ReplicaReview.objects.filter(id=4).exists())
+        self.assertEqual(replica.high_water_mark(), 5)
+
+
+@override_settings(REVIEW_OUTBOX=True, REVIEW_OUTBOX_THREAD=True, REVIEW_OUTBOX_POLL_SECONDS=0.05)
+class OutboxStartupTests(TransactionTestCase):
+
+    def test_pending_entry_delivered_after_restart(self):
+        # An entry left pending by a previous process, with no new enqueue
+        entry = PendingReview.objects.create(
+            idempotency_key="left-over", username="alice", dealer_id=1,
+            payload={"name": "Alice", "dealership": 1, "review": "Great"})
+        stored = {"id": 42, "dealership": 1, "review": "Great"}
+        with mock.patch.object(outbox, "post_reviews", return_value=[stored]), \
+                mock.patch.object(outbox, "_worker", None):
+            apps.get_app_config("djangoapp").ready()
+            # Loading the app (as management commands do) starts nothing
+            self.assertIsNone(outbox._worker)
+            self.client.get("/djangoapp/api/get_cars/")
+            worker = outbox._worker
+            try:
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    entry.refresh_from_db()
+                    if entry.status == PendingReview.DELIVERED:
+                        break
+                    time.sleep(0.05)
+            finally:
+                worker.stop()
+                worker.join(5)
+        self.assertEqual((entry.status, entry.review_id), (PendingReview.DELIVERED, 42))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlam = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * geo.EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class DealerIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = random.Random(18)
+        self.dealers = [{"id": i, "lat": rng.uniform(-80, 80), "long": rng.uniform(-180, 180)}
+                        for i in range(300)]
+        # Clustered on both sides of the antimeridian
+        self.dealers += [{"id": 300 + i, "lat": rng.uniform(-5, 5), "long": lon}
+                         for i, lon in enumerate([179.9, -179.9, 179.5, -179.5, 178.0, -178.0])]
+        self.dealers.append({"id": 999, "lat": "not a number", "long": 0})
+        self.index = geo.DealerIndex(self.dealers)
+
+    def brute_force(self, lat, lon, k, radius_km=None):
+        found = sorted((haversine_km(lat, lon, float(d["lat"]), float(d["long"])), d["id"])
+                       for d in self.dealers if d["id"] != 999)
+        if radius_km is not None:
+            found = [pair for pair in found if pair[0] <= radius_km]
+        return found[:k]
+
+    def assertMatches(self, result, expected):
+        self.assertEqual([dealer["id"] for _, dealer in result], [i for _, i in expected])
+        for (distance, _), (expected_distance, _) in zip(result, expected):
+            self.assertAlmostEqual(distance, expected_distance, places=6)
+
+    def test_invalid_coordinates_are_skipped(self):
+        self.assertEqual(self.index.size, len(self.dealers) - 1)
+
+    def test_k_nearest_matches_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            lat, lon = rng.uniform(-85, 85), rng.uniform(-180, 180)
+            self.assertMatches(self.index.nearest(lat, lon, k=5), self.brute_force(lat, lon, 5))
+
+    def test_radius_matches_brute_force(self):
+        rng = random.Random(8)
+        for _ in range(50):
+            lat, lon = rng.uniform(-85, 85), rng.uniform(-180, 180)
+            self.assertMatches(self.index.nearest(lat, lon, k=1000, radius_km=2500),
+                               self.brute_force(lat, lon, 1000, radius_km=2500))
+
+    def test_antimeridian(self):
+        for lon in (179.99, -179.99, 180.0, -180.0):
+            self.assertMatches(self.index.nearest(0.0, lon, k=6),
+                               self.brute_force(0.0, lon, 6))
+            self.assertMatches(self.index.nearest(0.0, lon, k=50, radius_km=300),
+                               self.brute_force(0.0, lon, 50, radius_km=300))
+
+
+class JSONArrayParserTests(SimpleTestCase):
+
+    document = json.dumps([
+        {"id": 1, "review": 'Said "great", then left \\ é☃', "price": -12.5e3},
+        {"id": 22, "tags": ["a", "b,]"], "nested": {"x": [1, 2.25, None, True, False]}},
+        "plain string with ] and ,",
+        4.5,
+        -7,
+        1e-3,
+        [],
+        {},
+    ])
+
+    def parse(self, chunks):
+        return list(streaming.iter_json_array(chunks))
+
+    def test_every_split_point(self):
+        expected = json.loads(self.document)
+        for split in range(1, len(self.document)):
+            chunks = [self.document[:split], self.document[split:]]
+            self.assertEqual(self.parse(chunks), expected, f"split at {split}")
+
+    def test_one_character_chunks(self):
+        self.assertEqual(self.parse(iter(self.document)), json.loads(self.document))
+
+    def test_numbers_are_not_cut_at_chunk_ends(self):
+        self.assertEqual(self.parse(["[1", "23, 4", ".5", "e1, -", "6]"]), [123, 45.0, -6])
+
+    def test_truncated_array_raises(self):
+        with self.assertRaises(ValueError):
+            self.parse(['[{"id": 1}, {"id"'])
+
+    def test_non_array_raises(self):
+        with self.assertRaises(ValueError):
+            self.parse(['{"id": 1}'])
+
+
+class InventorySearchTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = random.Random(19)
+        self.cars = [{
+            "id": i,
+            "dealer_id": rng.randint(1, 5),
+            "make": rng.choice(["Audi", "BMW", "Toyota"]),
+            "model": rng.choice(["A4", "X5", "Camry", "Corolla"]),
+            "bodyType": rng.choice(["SUV", "Sedan"]),
+            "year": rng.randint(2010, 2024),
+            "mileage": rng.randint(0, 200000),
+            # Some records lack a usable price
+            "price": rng.choice([rng.randint(5000, 80000)] * 9 + [None]),
+        } for i in range(400)]
+        self.index = inventory_index.InventoryIndex(self.cars)
+
+    def linear_scan(self, criteria, ranges, sort, descending):
+        def matches(car):
+            for param, values in criteria.items():
+                field = inventory_index.CATEGORICAL[param]
+                if str(car.get(field, "")).lower() not in [value.lower() for value in values]:
+                    return False
+            for param, (low, high) in ranges.items():
+                value = car.get(inventory_index.NUMERIC[param])
+                if not isinstance(value, (int, float)):
+                    return False
+                if (low is not None and value < low) or (high is not None and value > high):
+                    return False
+            return isinstance(car.get(sort), (int, float))
+        found = [(car[sort], position) for position, car in enumerate(self.cars) if matches(car)]
+        return [self.cars[position] for _, position in sorted(found, reverse=descending)]
+
+    def test_matches_linear_scan(self):
+        queries = [
+            ({}, {}),
+            ({"make": ["audi"]}, {}),
+            ({"make": ["BMW", "Toyota"], "body_type": ["suv"]}, {"year": (2015, None)}),
+            ({"dealer_id": ["3"]}, {"price": (10000, 30000), "mileage": (None, 50000)}),
+            ({"model": ["Camry"], "dealer_id": ["1", "2"]}, {"year": (2012, 2020)}),
+            ({"make": ["Nope"]}, {}),
+        ]
+        for criteria, ranges in queries:
+            for sort in inventory_index.NUMERIC:
+                for descending in (False, True):
+                    expected = self.linear_scan(criteria, ranges, sort, descending)
+                    total, cars = self.index.search(
+                        criteria, ranges, sort, descending, offset=0, limit=1000)
+                    self.assertEqual((total, cars), (len(expected), expected),
+                                     f"{criteria} {ranges} sort={sort} desc={descending}")
+
+    def test_query_parameters_and_cursor(self):
+        params = {"make": "Audi,BMW", "price_max": "50000", "sort": "-year", "limit": "7"}
+        expected = self.linear_scan({"make": ["Audi", "BMW"]}, {"price": (None, 50000)},
+                                    "year", True)
+        pages = []
+        with mock.patch.object(inventory_index, "get_index", return_value=self.index):
+            cursor = None
+            while True:
+                query = dict(params, **({"cursor": str(cursor)} if cursor is not None else {}))
+                total, cars, cursor = inventory_index.search(query)
+                self.assertEqual(total, len(expected))
+                pages.extend(cars)
+                if cursor is None:
+                    break
+        self.assertEqual(pages, expected)
+
+    def test_unknown_sort_is_rejected(self):
+        with mock.patch.object(inventory_index, "get_index", return_value=self.index):
+            with self.assertRaises(InvalidQuery):
+                inventory_index.search({"sort": "colour"})
+
+
+def walk_pages(fetch, params):
+    """Follow ``cursor`` through every page of ``fetch(params)``; returns all rows."""
+    rows, cursor = [], None
+    while True:
+        page, cursor = fetch(dict(params, **({"cursor": str(cursor)} if cursor else {})))
+        rows.extend(page)
+        if cursor is None:
+            return rows
+
+
+class CatalogQueryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(10)
+        makes = [CarMake.objects.create(name=name) for name in ("Audi", "BMW", "Toyota")]
+        for i in range(60):
+            CarModel.objects.create(
+                car_make=rng.choice(makes), name=f"Model {i}", dealer_id=rng.randint(1, 5),
+                type=rng.choice(CarModel.CAR_TYPES)[0], year=rng.randint(2000, 2023))
+
+    def test_cursor_round_trip(self):
+        queries = [{}, {"make": "bmw"}, {"type": "suv", "year_min": "2010"},
+                   {"year_min": "2005", "year_max": "2015", "make": "Audi"}]
+        for params in queries:
+            expected = CarModel.objects.order_by("id")
+            if "make" in params:
+                expected = expected.filter(car_make__name__iexact=params["make"])
+            if "type" in params:
+                expected = expected.filter(type=params["type"].upper())
+            if "year_min" in params:
+                expected = expected.filter(year__gte=int(params["year_min"]))
+            if "year_max" in params:
+                expected = expected.filter(year__lte=int(params["year_max"]))
+            for limit in ("1", "7", "500"):
+                rows = walk_pages(catalog.query, dict(params, limit=limit, fields="id,CarModel"))
+                self.assertEqual([row["id"] for row in rows],
+                                 list(expected.values_list("id", flat=True)), f"{params} {limit}")
+
+    def test_projection(self):
+        rows, _ = catalog.query({"limit": "1", "fields": "CarMake,year"})
+        self.assertEqual(set(rows[0]), {"CarMake", "year"})
+        with self.assertRaises(InvalidQuery):
+            catalog.query({"fields": "price"})
+
+
+class PaginateListTests(SimpleTestCase):
+
+    def test_cursor_round_trip(self):
+        rng = random.Random(11)
+        items = [{"id": item_id, "state": rng.choice(["KS", "TX"])}
+                 for item_id in rng.sample(range(1, 1000), 80)]
+        expected = sorted(item["id"] for item in items if item["state"] == "TX")
+
+        def fetch(params):
+            return pagination.paginate_list(items, params, {"id", "state"}, ["id"],
+                                            predicate=lambda item: item["state"] == "TX")
+
+        for limit in ("1", "9", "500"):
+            rows = walk_pages(fetch, {"limit": limit})
+            self.assertEqual([row["id"] for row in rows], expected)
+
+
+class LoadRecordsTests(TestCase):
+
+    records = [
+        {"make": "Audi", "model": "A4", "bodyType": "Sedan", "year": 2020, "dealer_id": 1},
+        {"make": "Audi", "model": "Q7", "bodyType": "SUV", "year": 2021, "dealer_id": 2},
+        {"make": "BMW", "model": "X5", "bodyType": "SUV", "year": 2019, "dealer_id": 3,
+         "description": "Bavarian"},
+        {"make": "BMW", "model": "X5", "bodyType": "bogus", "year": 2019},
+    ]
+
+    def counts(self):
+        return CarMake.objects.count(), CarModel.objects.count()
+
+    def test_reload_is_idempotent_and_updates_in_place(self):
+        first = loader.load_records(self.records)
+        self.assertEqual(first, {"makes": 2, "models": 3, "skipped": 1})
+        counts = self.counts()
+        changed = [dict(self.records[0], dealer_id=9),
+                   dict(self.records[2], description="Bavarian Motor Works"),
+                   {"make": "audi", "model": "Q7", "bodyType": "Wagon", "year": 2021,
+                    "description": "Vorsprung"}]
+        loader.load_records(self.records + changed)
+        self.assertEqual(self.counts(), counts)
+        self.assertEqual(CarModel.objects.get(name="A4").dealer_id, 9)
+        self.assertEqual(CarModel.objects.get(name="Q7").type, "WAGON")
+        descriptions = dict(CarMake.objects.values_list("name", "description"))
+        self.assertEqual(descriptions, {"Audi": "Vorsprung", "BMW": "Bavarian Motor Works"})
+
+
+class GetCarsETagTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        make = CarMake.objects.create(name="Audi")
+        CarModel.objects.create(car_make=make, name="A4", dealer_id=1, year=2020)
+
+    def test_not_modified_until_the_catalog_changes(self):
+        url = "/djangoapp/api/get_cars/"
+        first = self.client.get(url)
+        etag = first["ETag"]
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        CarModel.objects.create(car_make=CarMake.objects.get(), name="Q7", dealer_id=1,
+                                year=2021)
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertIn("Q7", [car["CarModel"] for car in json.loads(changed.content)["CarModels"]])
+
+
+class SingleFlightTests(SimpleTestCase):
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = restapis.SingleFlight()
+        callers = 8
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            # Hold the flight open until every other caller has joined it
+            deadline = time.monotonic() + 5
+            while flight.shared < callers - 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            return {"reviews": [1, 2]}
+
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            results = list(pool.map(lambda _: flight.do("key", fetch), range(callers)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"reviews": [1, 2]}] * callers)
+        # Every caller gets its own copy to mutate
+        self.assertEqual(len({id(result) for result in results}), callers)
+
+    def test_later_call_runs_again(self):
+        flight = restapis.SingleFlight()
+        calls = []
+        for _ in range(2):
+            flight.do("key", lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "sentiment": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+})
+class SentimentCacheTests(SimpleTestCase):
+
+    def test_hits_misses_and_lru_eviction(self):
+        sentiments = restapis.SentimentCache(2)
+        a, b, c, d = (restapis.SentimentCache.key_for(text) for text in "abcd")
+        sentiments.set_many({a: "positive", b: "negative", c: "neutral"})
+        # Only the two most recent entries are kept in process
+        self.assertEqual(sentiments.get_many([a, b, c]), {b: "negative", c: "neutral"})
+        self.assertEqual(sentiments.stats(),
+                         {"size": 2, "max_entries": 2, "hits": 2, "misses": 1})
+        # Reading b makes c the least recently used, so d evicts it
+        sentiments.get_many([b])
+        sentiments.set_many({d: "positive"})
+        self.assertEqual(set(sentiments.get_many([b, c, d])), {b, d})
+        self.assertEqual(sentiments.stats()["hits"], 5)
+        self.assertEqual(sentiments.stats()["misses"], 2)
+
+    def test_key_ignores_whitespace_differences(self):
+        self.assertEqual(restapis.SentimentCache.key_for("Great  car\n"),
+                         restapis.SentimentCache.key_for(" Great car"))
+
+
+MICROSERVICES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "microservices")
+
+
+@unittest.skipUnless(importlib.util.find_spec("flask"), "the sentiment service needs Flask")
+class SentimentServiceTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # app.py imports sentiment_engine as a top-level module, as in its container
+        sys.path.insert(0, MICROSERVICES_DIR)
+        cls.addClassCleanup(sys.path.remove, MICROSERVICES_DIR)
+        cls.service = importlib.import_module("app").app.test_client()
+
+    def test_batch_matches_single_text_endpoint_in_order(self):
+        texts = ["Fantastic service, I love this dealer!", "Terrible, rude and slow.",
+                 "The car is blue.", "Fantastic service, I love this dealer!",
+                 "Not bad at all", ""]
+        response = self.service.post("/analyze_batch", json={"texts": texts})
+        self.assertEqual(response.status_code, 200)
+        batch = response.get_json()["sentiments"]
+        single = [json.loads(self.service.get(f"/analyze/{quote(text)}").data)["sentiment"]
+                  for text in texts if text]
+        self.assertEqual(batch[:-1], single)
+        self.assertEqual(batch[:3], ["positive", "negative", "neutral"])
+        self.assertEqual(len(batch), len(texts))
+
+    def test_batch_requires_a_list(self):
+        self.assertEqual(self.service.post("/analyze_batch", json={"texts": "x"}).status_code, 400)
@@ -1,29 +1,48 @@
 # djangoapp/urls.py
 
+from django.conf import settings
 from django.urls import path
 from django.views.generic import TemplateView
 from . import views
 
+# In ASGI mode the backend-bound views are served by their async variants
+if settings.ASYNC_VIEWS:
+    from . import async_views as api_views
+else:
+    api_views = views
+
 urlpatterns = [
     # API Endpoints (prefixed with 'api/')
     path('api/login/', views.login_user, name='api_login'),
     path('api/register/', views.registration, name='api_register'),
     path('api/logout/', views.logout_user, name='api_logout'),
-    path('api/dealers/', views.fetch_dealers, name='api_dealers_page'),
+    path('api/dealers/', api_views.fetch_dealers, name='api_dealers_page'),
+    # Must precede dealers/<str:state>/, which would otherwise match "nearby"
+    path('api/dealers/nearby/', api_views.fetch_nearby_dealers, name='api_dealers_nearby'),
     path(
         'api/dealers/<str:state>/',
-        views.fetch_dealers,
+        api_views.fetch_dealers,
         name='api_dealers_by_state'),
     path(
         'api/dealer/<int:dealer_id>/',
-        views.get_dealer_details,
+        api_views.get_dealer_details,
         name='api_dealer_details_page'),
+    path(
+        'api/dealer/<int:dealer_id>/full/',
+        api_views.get_dealer_page,
+        name='api_dealer_page'),
     path(
         'api/reviews/dealer/<int:dealer_id>/',
-        views.get_dealer_reviews,
+        api_views.get_dealer_reviews,
         name='api_dealer_reviews_page'),
     path('api/get_cars/', views.get_cars, name='api_get_cars'),
-    path('api/add_review/', views.add_review, name='api_add_review_page'),
+    path('api/inventory/search/', views.search_inventory, name='api_inventory_search'),
+    path('api/add_review/', api_views.add_review, name='api_add_review_page'),
+    path('api/reviews/pending/', views.pending_reviews, name='api_pending_reviews'),
+    path(
+        'api/reviews/pending/<str:idempotency_key>/',
+        views.pending_reviews,
+        name='api_pending_review'),
 
     # Frontend Routes (all returning index.html)
     path('', TemplateView.as_view(template_name="index.html"), name='home'),
@@ -74,5 +93,5 @@ urlpatterns = [
         TemplateView.as_view(
             template_name="favicon.ico"),
         name='favicon'),
-    path('get_inventory/<int:dealer_id>', views.get_inventory, name='get_inventory'),
+    path('get_inventory/<int:dealer_id>', api_views.get_inventory, name='get_inventory'),
 ]
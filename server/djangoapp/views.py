@@ -1,20 +1,33 @@
 # djangoapp/views.py
 
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
 import logging
 import json
 from django.db.utils import OperationalError
-from .populate import initiate
-from .models import CarMake, CarModel
+from django.utils.cache import get_conditional_response
+from . import (
+    catalog, dealer_cache, geo, inventory_index, metrics, outbox, replica, resilience,
+    review_stats, streaming,
+)
+from .pagination import (
+    MAX_PAGE_SIZE, InvalidQuery, paginate_list, parse_float, parse_int, wants_page,
+)
 from .restapis import (
     backend_url,
+    fan_out,
     get_request,
     post_review,
-    analyze_review_sentiments,
-    searchcars_request
+    analyze_review_sentiments_batch,
+    searchcars_request,
+    searchcars_request_url,
+    sentiment_batch_size,
+    sentiment_cache,
+    single_flight,
+    stream_get,
+    unscored_reviews
 )
 
 # Initialize logger
@@ -27,17 +40,37 @@ if not logger.handlers:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+
 def json_response(data, status=200):
     return JsonResponse(data, status=status)
 
+
 def custom_404(request, exception):
     return json_response({'error': 'Not Found'}, status=404)
 
+
 def custom_500(request):
     return json_response({'error': 'Internal Server Error'}, status=500)
 
+
+def metrics_view(request):
+    """Prometheus text exposition of this process's request/upstream histograms."""
+    stats = sentiment_cache.stats()
+    extra = [
+        "# TYPE djangoapp_sentiment_cache_hits_total counter",
+        f"djangoapp_sentiment_cache_hits_total {stats['hits']}",
+        "# TYPE djangoapp_sentiment_cache_misses_total counter",
+        f"djangoapp_sentiment_cache_misses_total {stats['misses']}",
+        "# TYPE djangoapp_sentiment_cache_entries gauge",
+        f"djangoapp_sentiment_cache_entries {stats['size']}",
+        "# TYPE djangoapp_singleflight_shared_total counter",
+        f"djangoapp_singleflight_shared_total {single_flight.shared}",
+    ] + resilience.render_metrics()
+    return HttpResponse(metrics.render(extra), content_type="text/plain; version=0.0.4")
+
 # ===== Authentication Views =====
 
+
 @csrf_exempt
 def login_user(request):
     if request.method != "POST":
@@ -57,6 +90,7 @@ def login_user(request):
     logger.warning(f"Authentication failed for user '{username}'.")
     return json_response({"status": "Failed"}, status=401)
 
+
 @csrf_exempt
 def logout_user(request):
     if request.method != "POST":
@@ -65,6 +99,7 @@ def logout_user(request):
     logger.info("User logged out successfully.")
     return json_response({"userName": ""})
 
+
 @csrf_exempt
 def registration(request):
     if request.method != "POST":
@@ -99,51 +134,123 @@ def registration(request):
 
 # ===== Car Model and Make Views =====
 
+
 def get_cars(request):
     try:
-        if CarMake.objects.count() == 0:
-            logger.info("No CarMake records found. Running initiate() to populate data...")
-            initiate()
-            logger.info("Data population completed.")
-        car_models = CarModel.objects.select_related('car_make').all()
-        cars = [{"CarModel": cm.name, "CarMake": cm.car_make.name} for cm in car_models]
-        logger.info(f"Retrieved {len(cars)} car models successfully.")
-        return json_response({"CarModels": cars})
+        if wants_page(request.GET, catalog.FILTERS):
+            # Filtered/paginated requests go to the (indexed) table; the
+            # snapshot only serves the full unfiltered list
+            cars, next_cursor = catalog.query(request.GET)
+            return json_response({"CarModels": cars, "next_cursor": next_cursor})
+        # The catalog is loaded at deploy time (manage.py load_catalog)
+        snapshot = catalog.get_snapshot()
+        # Served from the precomputed snapshot; 304 when the client's ETag matches
+        response = get_conditional_response(request, etag=snapshot["etag"])
+        if response is None:
+            response = HttpResponse(snapshot["body"], content_type="application/json")
+        response["ETag"] = snapshot["etag"]
+        return response
+    except InvalidQuery as exc:
+        return json_response({"error": str(exc)}, status=400)
     except OperationalError:
         logger.error("Database table not found. Have you run migrations?", exc_info=True)
-        return json_response({"error": "Failed to retrieve car models. Have you run migrations?"}, status=500)
+        return json_response(
+            {"error": "Failed to retrieve car models. Have you run migrations?"}, status=500)
     except Exception as exc:
         logger.error(f"Exception in get_cars: {exc}", exc_info=True)
         return json_response({"error": "Failed to retrieve car models"}, status=500)
 
 # ===== Dealer Views =====
 
+
+DEALER_FIELDS = (
+    "id", "full_name", "short_name", "city", "state", "st", "address", "zip", "lat", "long",
+)
+DEALER_FILTERS = {"state"}
+
+
+def review_stats_for(dealers):
+    """``{"stats": ...}`` for each dealer, from the precomputed aggregates."""
+    stats = review_stats.stats_for([dealer["id"] for dealer in dealers if "id" in dealer])
+    return [{"stats": stats.get(dealer.get("id"), dict(review_stats.EMPTY_STATS))}
+            for dealer in dealers]
+
+
+def dealers_payload(dealers, params):
+    """
+    The dealers payload, keyset-paginated and projected when the query
+    string asks for it (``cursor``/``limit``/``fields``/``state``), with
+    review aggregates attached for ``include=stats``.
+    """
+    extra = review_stats_for if "stats" in params.get("include", "").split(",") else None
+    if not wants_page(params, DEALER_FILTERS):
+        if extra is not None:
+            dealers = [dict(dealer, **added) for dealer, added in zip(dealers, extra(dealers))]
+        return {"status": 200, "dealers": dealers}
+    state = params.get("state")
+    predicate = (lambda dealer: dealer.get("state") == state) if state else None
+    page, next_cursor = paginate_list(
+        dealers, params, DEALER_FIELDS, DEALER_FIELDS, predicate, extra)
+    return {"status": 200, "dealers": page, "next_cursor": next_cursor}
+
+
+def dealers_response(dealers, params, fmt=None):
+    payload = dealers_payload(dealers, params)
+    if fmt is None:
+        return json_response(payload)
+    return streaming.streaming_response(payload.pop("dealers"), fmt, "dealers", payload)
+
+
 def fetch_dealers(request, state="All"):
     logger.info(f"Fetching dealerships for state: {state}")
     try:
-        if state != "All":
-            endpoint = f"/fetchDealers/{state}"  # No trailing slash
-        else:
-            endpoint = "/fetchDealers"
-        full_url = f"{backend_url}{endpoint}"
-        logger.info(f"Calling backend URL: {full_url}")
-        dealers = get_request(full_url)
+        dealers = dealer_cache.get_dealers(state)
         if dealers is not None:
             logger.info(f"Retrieved {len(dealers)} dealers.")
-            return json_response({"status": 200, "dealers": dealers})
+            return dealers_response(dealers, request.GET, streaming.stream_format(request))
         else:
             logger.error("Failed to fetch dealers from backend API.")
             return json_response({"status": 500, "error": "Failed to fetch dealers"}, status=500)
-    except Exception as e:
+    except InvalidQuery as exc:
+        return json_response({"status": 400, "error": str(exc)}, status=400)
+    except Exception:
         logger.exception("Exception in fetch_dealers")
         return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
 
+
+def nearby_response(params):
+    """
+    Dealers nearest to ``lat``/``lon`` from the in-memory spatial index,
+    limited to ``radius`` km if given, each with its ``distance_km``.
+    """
+    try:
+        lat = parse_float(params, "lat", minimum=-90, maximum=90, required=True)
+        lon = parse_float(params, "lon", minimum=-180, maximum=180, required=True)
+        radius = parse_float(params, "radius", minimum=0)
+        limit = min(parse_int(params, "limit", default=10, minimum=1), MAX_PAGE_SIZE)
+    except InvalidQuery as exc:
+        return json_response({"status": 400, "error": str(exc)}, status=400)
+    index = geo.get_index()
+    if index is None:
+        logger.error("Dealer list unavailable; cannot build the spatial index.")
+        return json_response({"status": 500, "error": "Failed to fetch dealers"}, status=500)
+    dealers = [dict(dealer, distance_km=round(distance, 3))
+               for distance, dealer in index.nearest(lat, lon, k=limit, radius_km=radius)]
+    return json_response({"status": 200, "dealers": dealers})
+
+
+def fetch_nearby_dealers(request):
+    try:
+        return nearby_response(request.GET)
+    except Exception:
+        logger.exception("Exception in fetch_nearby_dealers")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
+
+
 def get_dealer_details(request, dealer_id):
     logger.info(f"Fetching dealer details for ID: {dealer_id}")
     try:
-        full_url = f"{backend_url}/fetchDealer/{dealer_id}"  # No trailing slash
-        logger.info(f"Fetching dealer details from URL: {full_url}")
-        dealer = get_request(full_url)
+        dealer = dealer_cache.get_dealer(dealer_id)
         if dealer is not None:
             logger.info(f"Dealer details retrieved for ID: {dealer_id}")
             return json_response({"status": 200, "dealer": dealer})
@@ -153,26 +260,130 @@ def get_dealer_details(request, dealer_id):
         logger.exception("Exception in get_dealer_details")
         return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
 
-def get_dealer_reviews(request, dealer_id):
-    logger.info(f"Fetching reviews for dealer ID: {dealer_id}")
-    try:
+
+def review_texts(reviews):
+    return [review_detail.get('review', '') for review_detail in reviews]
+
+
+def attach_sentiments(reviews, sentiments):
+    if sentiments is None:
+        sentiments = ['neutral'] * len(reviews)
+    for review_detail, sentiment in zip(reviews, sentiments):
+        review_detail['sentiment'] = sentiment or 'neutral'
+    return reviews
+
+
+def fetch_scored_reviews(dealer_id):
+    # Concurrent requests for the same dealer share one fetch-and-score
+    return single_flight.do(("scored_reviews", str(dealer_id)),
+                            lambda: _fetch_scored_reviews(dealer_id))
+
+
+def _fetch_scored_reviews(dealer_id):
+    if replica.enabled():
+        reviews = replica.dealer_reviews(dealer_id)
+    else:
         full_url = f"{backend_url}/fetchReviews/dealer/{dealer_id}"  # No trailing slash
         logger.info(f"Fetching reviews from URL: {full_url}")
         reviews = get_request(full_url)
-        if reviews is not None:
-            for review_detail in reviews:
-                sentiment = analyze_review_sentiments(review_detail.get('review', ''))
-                review_detail['sentiment'] = sentiment.get('sentiment', 'neutral') if sentiment else 'neutral'
-            logger.info(f"Retrieved {len(reviews)} reviews for dealer ID: {dealer_id}")
-            return json_response({"status": 200, "reviews": reviews})
+    if reviews is not None:
+        # Only legacy reviews lack a stored sentiment; score those in one round trip
+        unscored = unscored_reviews(reviews)
+        if unscored:
+            attach_sentiments(unscored, analyze_review_sentiments_batch(review_texts(unscored)))
+    return reviews
+
+
+def score_review_batches(reviews):
+    """
+    Attach sentiment to streamed reviews a batch at a time, so at most one
+    batch is held in memory; only legacy reviews without a stored
+    sentiment are sent to the scorer.
+    """
+    for batch in streaming.batched(reviews, sentiment_batch_size):
+        unscored = unscored_reviews(batch)
+        if unscored:
+            attach_sentiments(unscored, analyze_review_sentiments_batch(review_texts(unscored)))
+        yield from batch
+
+
+def get_dealer_reviews(request, dealer_id):
+    logger.info(f"Fetching reviews for dealer ID: {dealer_id}")
+    try:
+        fmt = streaming.stream_format(request)
+        if fmt is not None and replica.enabled():
+            reviews = score_review_batches(replica.iter_dealer_reviews(dealer_id))
+            return streaming.streaming_response(reviews, fmt, "reviews")
+        if fmt is not None:
+            chunks = stream_get(f"{backend_url}/fetchReviews/dealer/{dealer_id}")
+            if chunks is not None:
+                reviews = score_review_batches(streaming.iter_json_array(chunks))
+                return streaming.streaming_response(reviews, fmt, "reviews")
+        else:
+            reviews = fetch_scored_reviews(dealer_id)
+            if reviews is not None:
+                logger.info(f"Retrieved {len(reviews)} reviews for dealer ID: {dealer_id}")
+                return json_response({"status": 200, "reviews": reviews})
         logger.warning(f"No reviews found for dealer ID {dealer_id}.")
         return json_response({"status": 404, "error": "No reviews found"}, status=404)
+    except InvalidQuery as exc:
+        return json_response({"status": 400, "error": str(exc)}, status=400)
     except Exception:
         logger.exception("Exception in get_dealer_reviews")
         return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
 
+
+def dealer_page_response(dealer_id, dealer, reviews, cars):
+    parts = {"dealer": dealer, "reviews": reviews, "cars": cars}
+    errors = [name for name, value in parts.items() if value is None]
+    if len(errors) == len(parts):
+        logger.error(f"All upstream calls failed for dealer page {dealer_id}.")
+        return json_response({"status": 502, "error": "Upstream services unavailable"}, status=502)
+    if errors:
+        logger.warning(f"Partial dealer page for ID {dealer_id}; failed parts: {errors}")
+    return json_response({"status": 200, **parts, "errors": errors})
+
+
+def get_dealer_page(request, dealer_id):
+    """
+    Dealer details, sentiment-scored reviews and inventory in one payload.
+    The three upstream fetches run in parallel; a part that fails comes back
+    as null and is listed under "errors".
+    """
+    logger.info(f"Fetching full dealer page for ID: {dealer_id}")
+    try:
+        dealer, reviews, cars = fan_out([
+            lambda: dealer_cache.get_dealer(dealer_id),
+            lambda: fetch_scored_reviews(dealer_id),
+            lambda: searchcars_request(f"/cars/{dealer_id}"),
+        ])
+        return dealer_page_response(dealer_id, dealer, reviews, cars)
+    except Exception:
+        logger.exception("Exception in get_dealer_page")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
+
 # ===== Review Submission View =====
 
+
+def record_review_stats(review):
+    # The review is already stored; a stats failure is repaired by rebuild_review_stats
+    try:
+        review_stats.record_review(review)
+    except Exception:
+        logger.exception("Failed to update dealer review stats")
+
+
+def record_replica_review(review):
+    # Keeps the replica current between syncs; a failure is repaired by the next
+    # sync_replica, whose cursor these local writes do not advance
+    if not replica.enabled():
+        return
+    try:
+        replica.record_review(review)
+    except Exception:
+        logger.exception("Failed to add review to the local replica")
+
+
 @csrf_exempt
 def add_review(request):
     if request.method != "POST":
@@ -186,10 +397,15 @@ def add_review(request):
     except json.JSONDecodeError:
         logger.error("JSON decode error in add_review")
         return json_response({"status": 400, "message": "Invalid JSON format"}, status=400)
+    if outbox.enabled():
+        return queued_review_response(
+            data, request.user.username, request.headers.get("Idempotency-Key"))
     try:
         response = post_review(data)
         if response and "id" in response:
             logger.info(f"Review posted successfully by user '{request.user.username}'.")
+            record_review_stats(response)
+            record_replica_review(response)
             return json_response({"status": 200, "message": "Review posted successfully"})
         logger.error("Failed to post review via backend API. Response: " + str(response))
         return json_response({"status": 500, "message": "Error in posting review"}, status=500)
@@ -197,24 +413,85 @@ def add_review(request):
         logger.exception("Exception in add_review")
         return json_response({"status": 500, "message": "Internal Server Error"}, status=500)
 
+
+def queued_review_response(data, username, idempotency_key=None):
+    """Store the review in the outbox and acknowledge it with 202."""
+    try:
+        entry, created = outbox.enqueue(data, username, idempotency_key)
+    except outbox.InvalidReview as exc:
+        return json_response({"status": 400, "message": str(exc)}, status=400)
+    if created:
+        logger.info(f"Review {entry.idempotency_key} queued for delivery by user '{username}'.")
+    return json_response({
+        "status": 202,
+        "message": "Review accepted for delivery",
+        "idempotency_key": entry.idempotency_key,
+        "delivery_status": entry.status,
+    }, status=202)
+
+
+def pending_reviews(request, idempotency_key=None):
+    """The signed-in user's outbox submissions, or one of them by idempotency key."""
+    if not request.user.is_authenticated:
+        return json_response({"status": 403, "message": "Unauthorized"}, status=403)
+    if idempotency_key is not None:
+        submission = outbox.submission_for(request.user.username, idempotency_key)
+        if submission is None:
+            return json_response({"status": 404, "error": "Submission not found"}, status=404)
+        return json_response({"status": 200, "submission": submission})
+    try:
+        limit = min(parse_int(request.GET, "limit", default=50, minimum=1), MAX_PAGE_SIZE)
+    except InvalidQuery as exc:
+        return json_response({"status": 400, "error": str(exc)}, status=400)
+    submissions = outbox.pending_for(request.user.username, request.GET.get("status"), limit)
+    return json_response({"status": 200, "submissions": submissions})
+
+
+def inventory_endpoint(dealer_id, data):
+    # Determine which filter is provided; default to retrieving all cars for the dealer.
+    if 'year' in data:
+        return f"/carsbyyear/{dealer_id}/{data['year']}"
+    elif 'make' in data:
+        return f"/carsbymake/{dealer_id}/{data['make']}"
+    elif 'model' in data:
+        return f"/carsbymodel/{dealer_id}/{data['model']}"
+    elif 'mileage' in data:
+        return f"/carsbymaxmileage/{dealer_id}/{data['mileage']}"
+    elif 'price' in data:
+        return f"/carsbyprice/{dealer_id}/{data['price']}"
+    return f"/cars/{dealer_id}"
+
+
 def get_inventory(request, dealer_id):
     data = request.GET  # Get query parameters
     if dealer_id:
-        # Determine which filter is provided; default to retrieving all cars for the dealer.
-        if 'year' in data:
-            endpoint = f"/carsbyyear/{dealer_id}/{data['year']}"
-        elif 'make' in data:
-            endpoint = f"/carsbymake/{dealer_id}/{data['make']}"
-        elif 'model' in data:
-            endpoint = f"/carsbymodel/{dealer_id}/{data['model']}"
-        elif 'mileage' in data:
-            endpoint = f"/carsbymaxmileage/{dealer_id}/{data['mileage']}"
-        elif 'price' in data:
-            endpoint = f"/carsbyprice/{dealer_id}/{data['price']}"
-        else:
-            endpoint = f"/cars/{dealer_id}"
- 
-        cars = searchcars_request(endpoint)
+        try:
+            fmt = streaming.stream_format(request)
+        except InvalidQuery as exc:
+            return json_response({"status": 400, "error": str(exc)}, status=400)
+        if fmt is not None:
+            chunks = stream_get(searchcars_request_url(inventory_endpoint(dealer_id, data)))
+            if chunks is None:
+                return json_response(
+                    {"status": 500, "error": "Failed to fetch inventory"}, status=500)
+            return streaming.streaming_response(streaming.iter_json_array(chunks), fmt, "cars")
+        cars = searchcars_request(inventory_endpoint(dealer_id, data))
         return JsonResponse({"status": 200, "cars": cars})
     else:
         return JsonResponse({"status": 400, "message": "Bad Request"})
+
+
+def search_inventory(request):
+    """Multi-criteria search over the locally indexed inventory snapshot."""
+    try:
+        total, cars, next_cursor = inventory_index.search(request.GET)
+        return json_response(
+            {"status": 200, "total": total, "cars": cars, "next_cursor": next_cursor})
+    except InvalidQuery as exc:
+        return json_response({"status": 400, "error": str(exc)}, status=400)
+    except OSError:
+        logger.exception("Inventory snapshot unavailable")
+        return json_response({"status": 500, "error": "Inventory unavailable"}, status=500)
+    except Exception:
+        logger.exception("Exception in search_inventory")
+        return json_response({"status": 500, "error": "Internal Server Error"}, status=500)
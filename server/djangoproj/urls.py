@@ -2,12 +2,15 @@
 from django.contrib import admin
 from django.urls import path, include, re_path
 from django.views.generic import TemplateView
+from djangoapp.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('djangoapp/', include('djangoapp.urls')),
+    path('metrics', metrics_view, name='metrics'),
     # Catch‐all for React app (ensure API endpoints are already matched above)
     re_path(r'^.*$', TemplateView.as_view(template_name='index.html'), name='react-app'),
     # Explicitly add the searchcars route:
-    path('searchcars/<int:dealer_id>', TemplateView.as_view(template_name='index.html'), name='searchcars'),
+    path('searchcars/<int:dealer_id>', TemplateView.as_view(template_name='index.html'),
+         name='searchcars'),
 ]
@@ -4,5 +4,11 @@
 echo "Making migrations and migrating the database. "
 python manage.py makemigrations --noinput
 python manage.py migrate --noinput
+python manage.py createcachetable
+python manage.py load_catalog --seed database/data/car_records.json
+# Seed the local dealer/review replica when the views read from it
+if [ "$REPLICA_MODE" = "True" ]; then
+    python manage.py sync_replica
+fi
 python manage.py collectstatic --noinput
 exec "$@"
\ No newline at end of file
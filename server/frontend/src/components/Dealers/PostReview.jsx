@@ -91,7 +91,8 @@ const PostReview = () => {
         body: JSON.stringify(payload),
       });
       const responseData = await res.json();
-      if (responseData.status === 200) {
+      // 202: accepted into the outbox and delivered shortly
+      if (responseData.status === 200 || responseData.status === 202) {
         navigate(`/dealer/${id}/`);
       } else {
         setError("Failed to post review. Please try again.");